@@ -1,27 +1,45 @@
 from fastapi import FastAPI, HTTPException, Depends, Security
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
-import uvicorn
+import asyncio
 import logging
+import sys
 from typing import List, Optional
 from datetime import datetime, timedelta
 import os
 from dotenv import load_dotenv
 
+# Load environment variables before importing modules that read them at import time
+load_dotenv()
+
+if __name__ == "__main__":
+    # Hand over to the uvicorn CLI (same as running `uvicorn main:app ...` directly). Spawned
+    # processes - the solver/training pools and uvicorn's workers - re-run the __main__ script,
+    # and as __main__ this module would import TF/torch and build every service in each of them.
+    from utils.concurrency import web_concurrency
+    
+    if os.getenv("ENV") == "production":
+        # Multiple workers on uvloop/httptools; reload would force a single worker
+        options = ["--workers", str(web_concurrency()), "--loop", "uvloop", "--http", "httptools",
+                   "--log-level", "warning"]
+    else:
+        options = ["--reload", "--log-level", "info"]
+    os.execv(sys.executable, [sys.executable, "-m", "uvicorn", "main:app", "--host", "0.0.0.0", "--port", "8000", *options])
+
 from models.prediction_models import PredictionRequest, PredictionResponse, TechnicalAnalysisRequest, TechnicalAnalysisResponse
 from models.sentiment_models import SentimentAnalysisRequest, SentimentAnalysisResponse
 from models.portfolio_models import PortfolioOptimizationRequest, PortfolioOptimizationResponse
 from services.prediction_service import PredictionService
+from services._training import TRAINING_POOL
 from services.sentiment_service import SentimentService
-from services.portfolio_optimizer import PortfolioOptimizer
+from services.portfolio_optimizer import PortfolioOptimizer, PROCESS_POOL
+from services.portfolio_batcher import PortfolioBatcher
 from services.technical_analyzer import TechnicalAnalyzer
 from utils.auth import verify_jwt_token
 from utils.logger import setup_logger
 
-# Load environment variables
-load_dotenv()
-
 # Setup logging
 logger = setup_logger(__name__)
 
@@ -29,6 +47,7 @@ logger = setup_logger(__name__)
 prediction_service = PredictionService()
 sentiment_service = SentimentService()
 portfolio_optimizer = PortfolioOptimizer()
+portfolio_batcher = PortfolioBatcher(portfolio_optimizer)
 technical_analyzer = TechnicalAnalyzer()
 
 @asynccontextmanager
@@ -37,15 +56,27 @@ async def lifespan(app: FastAPI):
     logger.info("Starting AI Services...")
     await prediction_service.initialize()
     await sentiment_service.initialize()
+    # Compile/load the Numba kernels off the event loop so the first request doesn't pay for it
+    await asyncio.to_thread(portfolio_optimizer.warmup_kernels)
+    await portfolio_batcher.start()
     logger.info("AI Services started successfully")
     yield
     # Shutdown
     logger.info("Shutting down AI Services...")
+    await portfolio_batcher.stop()
+    await portfolio_optimizer.close()
+    await sentiment_service.close()
+    # Joining the pool workers blocks, so do it off the event loop
+    await asyncio.gather(
+        asyncio.to_thread(PROCESS_POOL.shutdown, cancel_futures=True),
+        asyncio.to_thread(TRAINING_POOL.shutdown, cancel_futures=True)
+    )
 
 app = FastAPI(
     title="Stock Trading AI Services",
     description="AI-powered services for stock trading including predictions, sentiment analysis, and portfolio optimization",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -147,12 +178,7 @@ async def optimize_portfolio(
     """Optimize portfolio allocation using modern portfolio theory"""
     try:
         logger.info(f"Portfolio optimization request by user {current_user.get('user_id')}")
-        optimization = await portfolio_optimizer.optimize(
-            symbols=request.symbols,
-            risk_tolerance=request.risk_tolerance,
-            investment_amount=request.investment_amount,
-            constraints=request.constraints
-        )
+        optimization = await portfolio_batcher.submit(request)
         return optimization
     except Exception as e:
         logger.error(f"Portfolio optimization failed: {str(e)}")
@@ -211,12 +237,3 @@ async def get_stock_recommendations(
     except Exception as e:
         logger.error(f"Failed to get recommendations for {symbol}: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to get recommendations: {str(e)}")
-
-if __name__ == "__main__":
-    uvicorn.run(
-        "main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
-        log_level="info"
-    )
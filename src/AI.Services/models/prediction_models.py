@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from enum import Enum
@@ -41,6 +41,9 @@ class TechnicalAnalysisRequest(BaseModel):
     indicators: List[str] = Field(default=["RSI", "MACD", "BB", "SMA", "EMA"], description="Technical indicators to calculate")
 
 class TechnicalIndicator(BaseModel):
+    # Instances are cached and shared between responses by the technical analyzer
+    model_config = ConfigDict(frozen=True)
+    
     name: str
     value: float
     signal: str  # "buy", "sell", "neutral"
@@ -0,0 +1,75 @@
+import numpy as np
+from numba import njit
+
+# Numeric kernels for the portfolio optimizer. All functions expect
+# C-contiguous arrays: float32 price/returns buffers, float64 weights.
+# cache=True persists the compiled code in __pycache__ (or NUMBA_CACHE_DIR
+# when set) so later process starts skip recompilation; the app warms them
+# up in its lifespan.
+
+@njit(cache=True, fastmath=True)
+def risk_stats(returns, w, q):
+    """Value at Risk (q-quantile, linear interpolation like np.percentile) and maximum
+    drawdown of the weighted portfolio, from a single pass over the (T, N) returns"""
+    n_rows, n_cols = returns.shape
+    port_ret = np.empty(n_rows)
+    cumulative = 1.0
+    peak = 0.0
+    drawdown = 0.0
+    for t in range(n_rows):
+        r = 0.0
+        for j in range(n_cols):
+            r += returns[t, j] * w[j]
+        port_ret[t] = r
+        
+        cumulative *= 1.0 + r
+        if cumulative > peak:
+            peak = cumulative
+        current = cumulative / peak - 1.0
+        if current < drawdown:
+            drawdown = current
+    
+    # Partial selection instead of a full sort for the quantile
+    pos = q * (n_rows - 1)
+    k = int(np.floor(pos))
+    frac = pos - k
+    part = np.partition(port_ret, k)
+    var = part[k]
+    if frac > 0.0 and k + 1 < n_rows:
+        upper = part[k + 1:].min()
+        var += frac * (upper - var)
+    
+    return abs(var), -drawdown
+
+@njit(cache=True, fastmath=True)
+def hhi(w):
+    """Herfindahl-Hirschman Index of the weight vector"""
+    total = 0.0
+    for i in range(w.shape[0]):
+        total += w[i] * w[i]
+    return total
+
+@njit(cache=True)
+def filled_returns(prices):
+    """Simple returns of a (T, N) price matrix, forward-filling gaps and back-filling leading gaps"""
+    n_rows, n_cols = prices.shape
+    returns = np.empty((n_rows - 1, n_cols), dtype=prices.dtype)
+    for j in range(n_cols):
+        first = 0
+        while first < n_rows and np.isnan(prices[first, j]):
+            first += 1
+        if first == n_rows:
+            # No data at all for this column
+            returns[:, j] = np.nan
+            continue
+        
+        # Leading gaps are back-filled with the first price, so their returns are zero
+        returns[:first, j] = 0.0
+        last = prices[first, j]
+        for t in range(first + 1, n_rows):
+            price = prices[t, j]
+            if np.isnan(price):
+                price = last
+            returns[t - 1, j] = price / last - 1.0
+            last = price
+    return returns
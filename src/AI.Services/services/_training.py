@@ -0,0 +1,37 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+
+from utils.concurrency import web_concurrency
+
+# Random Forest training for the prediction service. This module only depends on sklearn so the
+# spawned pool workers, which import it to unpickle train_random_forest, don't load TensorFlow
+# or Prophet the way importing services.prediction_service would.
+
+# Forests are grown by RF_GROWTH trees per refit until they reach this size, then retrained
+RF_MAX_ESTIMATORS = 200
+RF_GROWTH = 20
+
+# The cores are shared between the server workers; within one, between the pool workers and
+# the tree-building jobs each of them runs, so workers x jobs stays at about the core count
+_CORES = max(1, (os.cpu_count() or 1) // web_concurrency())
+TRAINING_WORKERS = min(3, _CORES)
+RF_JOBS = max(1, _CORES // TRAINING_WORKERS)
+
+# Worker processes for Random Forest training, shared by concurrent ensemble requests
+TRAINING_POOL = ProcessPoolExecutor(max_workers=TRAINING_WORKERS, mp_context=multiprocessing.get_context('spawn'))
+
+def train_random_forest(X_train: pd.DataFrame, y_train: pd.Series,
+                        model: Optional[RandomForestRegressor] = None) -> RandomForestRegressor:
+    """Fit the Random Forest model (runs in a training pool worker)"""
+    if model is None or model.n_features_in_ != X_train.shape[1] or model.n_estimators >= RF_MAX_ESTIMATORS:
+        model = RandomForestRegressor(n_estimators=100, n_jobs=RF_JOBS, random_state=42, warm_start=True)
+    else:
+        # warm_start keeps the existing trees and only fits the new ones on the latest data
+        model.n_estimators += RF_GROWTH
+    model.fit(X_train, y_train)
+    return model
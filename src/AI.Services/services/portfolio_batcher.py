@@ -0,0 +1,122 @@
+import asyncio
+import logging
+from collections import defaultdict
+from typing import List, Optional, Set, Tuple
+
+from models.portfolio_models import PortfolioOptimizationRequest, PortfolioOptimizationResponse
+from services.portfolio_optimizer import MarketData, PortfolioOptimizer
+
+logger = logging.getLogger(__name__)
+
+class PortfolioBatcher:
+    """Micro-batches concurrent optimization requests so each symbol universe is prepared once per batch"""
+    
+    def __init__(self, optimizer: PortfolioOptimizer, max_batch: int = 16, max_wait: float = 0.05):
+        self.optimizer = optimizer
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        # Groups run as their own tasks so a slow market data download doesn't hold up the queue
+        self._groups: Set[asyncio.Task] = set()
+    
+    async def start(self):
+        """Start the background batching task"""
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        """Stop the batching task and fail any requests still queued or in flight"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        
+        groups = list(self._groups)
+        for task in groups:
+            task.cancel()
+        await asyncio.gather(*groups, return_exceptions=True)
+        
+        while self._queue and not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Portfolio batcher stopped"))
+    
+    async def submit(self, request: PortfolioOptimizationRequest) -> PortfolioOptimizationResponse:
+        """Queue a request and wait for its optimization result"""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((request, future))
+        return await future
+    
+    async def _run(self):
+        """Collect batches from the queue and process them"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            
+            try:
+                while len(batch) < self.max_batch:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+            except asyncio.CancelledError:
+                # Stopped while collecting: these requests are no longer in the queue for stop() to fail
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(RuntimeError("Portfolio batcher stopped"))
+                raise
+            
+            groups = defaultdict(list)
+            for request, future in batch:
+                groups[frozenset(request.symbols)].append((request, future))
+            
+            for items in groups.values():
+                task = asyncio.create_task(self._process_group(items))
+                self._groups.add(task)
+                task.add_done_callback(self._groups.discard)
+    
+    async def _process_group(self, items: List[Tuple[PortfolioOptimizationRequest, asyncio.Future]]):
+        """Prepare market data once for a group, then optimize its requests against it concurrently"""
+        universe = list(dict.fromkeys(items[0][0].symbols))
+        try:
+            market_data = await self.optimizer.prepare_market_data(universe)
+            await asyncio.gather(*[
+                self._optimize_request(request, future, market_data, universe)
+                for request, future in items if not future.done()
+            ])
+        except Exception as e:
+            # _optimize_request resolves its own failures, so this is the market data download
+            logger.error(f"Failed to prepare market data for {universe}: {str(e)}")
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            # Only reached with pending futures when the group was cancelled by stop()
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(RuntimeError("Portfolio batcher stopped"))
+    
+    async def _optimize_request(self, request: PortfolioOptimizationRequest, future: asyncio.Future,
+                                market_data: MarketData, universe: List[str]):
+        """Optimize one request against its group's market data and resolve its future"""
+        try:
+            result = await self.optimizer.optimize(
+                symbols=request.symbols,
+                risk_tolerance=request.risk_tolerance,
+                investment_amount=request.investment_amount,
+                constraints=request.constraints,
+                market_data=self.optimizer.select_market_data(market_data, universe, request.symbols)
+            )
+            if not future.done():
+                future.set_result(result)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
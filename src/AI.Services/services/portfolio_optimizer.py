@@ -1,10 +1,17 @@
+import asyncio
+import hashlib
+import multiprocessing
+import os
 import numpy as np
 import pandas as pd
-import yfinance as yf
+import aiohttp
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from functools import reduce
+from typing import List, Dict, Any, Optional, Tuple
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from scipy.optimize import minimize
+import cvxpy as cp
 from sklearn.covariance import LedoitWolf
 import warnings
 warnings.filterwarnings('ignore')
@@ -13,124 +20,269 @@ from models.portfolio_models import (
     PortfolioOptimizationResponse, AllocationRecommendation, RiskMetrics,
     RiskTolerance, OptimizationObjective, PortfolioConstraint
 )
+from services._kernels import risk_stats, hhi, filled_returns
+from utils.cache import TTLCache
+from utils.concurrency import web_concurrency
+from utils.yahoo_fast import create_session, fetch_closes, fetch_company_info, fetch_crumb
 
 logger = logging.getLogger(__name__)
 
+MARKET_PROXY = 'SPY'
+# Placeholder company info is cached this long before the lookup is retried
+COMPANY_INFO_RETRY_TTL = 300
+
+# (returns, market returns, annualized mean returns, covariance, latest closes) for a symbol list
+MarketData = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
 class PortfolioOptimizer:
     def __init__(self):
         self.risk_free_rate = 0.02  # 2% risk-free rate
         self.trading_days = 252
+        self._history_cache = TTLCache(ttl=3600)
+        self._info_cache = TTLCache(ttl=86400)
+        self._covariance_cache = TTLCache(ttl=3600, maxsize=128)
+        self._session: Optional[aiohttp.ClientSession] = None
+        # Yahoo crumb paired with the session's cookie, fetched on the first company info lookup
+        self._crumb: Optional[str] = None
+        self._crumb_lock = asyncio.Lock()
+    
+    def warmup_kernels(self):
+        """Compile (or load from the on-disk cache) the numeric kernels at startup rather than on first request"""
+        weights = np.full(2, 0.5)
+        risk_stats(np.zeros((4, 2), dtype=np.float32), weights, 0.05)
+        hhi(weights)
+        filled_returns(np.ones((3, 2), dtype=np.float32))
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Shared HTTP session for market data, created on first use inside the event loop"""
+        if self._session is None or self._session.closed:
+            self._session = create_session()
+            self._crumb = None
+        return self._session
+    
+    async def close(self):
+        """Close the shared HTTP session"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+            self._crumb = None
+    
+    async def prepare_market_data(self, symbols: List[str]) -> MarketData:
+        """Fetch returns for the symbols and the market proxy and estimate mean returns and covariance"""
+        # Fetch historical data for the portfolio and the market proxy in one download; the proxy
+        # only feeds beta, so it may be missing unless it is part of the portfolio
+        _, columns, all_returns, all_closes = await self._fetch_portfolio_data(
+            list(dict.fromkeys(symbols + [MARKET_PROXY])),
+            optional=() if MARKET_PROXY in symbols else (MARKET_PROXY,)
+        )
+        
+        # Calculate returns and covariance matrix
+        idx = [columns.index(symbol) for symbol in symbols]
+        if MARKET_PROXY in columns:
+            market_returns = all_returns[:, columns.index(MARKET_PROXY)]
+        else:
+            # Too little market data makes beta fall back to 1.0
+            market_returns = np.empty(0, dtype=all_returns.dtype)
+        returns_np = np.ascontiguousarray(all_returns[:, idx])
+        mean_np = returns_np.mean(axis=0, dtype=np.float64) * self.trading_days
+        cov_matrix = self._calculate_covariance_matrix(returns_np, symbols)
+        
+        return returns_np, market_returns, mean_np, cov_matrix, all_closes[idx]
+    
+    def select_market_data(self, market_data: MarketData, universe: List[str], symbols: List[str]) -> MarketData:
+        """Reorder market data prepared for universe to match the order of symbols"""
+        if list(symbols) == list(universe):
+            return market_data
         
+        returns_np, market_returns, mean_np, cov_matrix, last_closes = market_data
+        idx = [universe.index(symbol) for symbol in symbols]
+        return (
+            np.ascontiguousarray(returns_np[:, idx]),
+            market_returns,
+            mean_np[idx],
+            np.asfortranarray(cov_matrix[np.ix_(idx, idx)]),
+            last_closes[idx]
+        )
+    
     async def optimize(self, symbols: List[str], risk_tolerance: RiskTolerance,
-                      investment_amount: float, constraints: List[PortfolioConstraint] = None) -> PortfolioOptimizationResponse:
+                      investment_amount: float, constraints: List[PortfolioConstraint] = None,
+                      market_data: Optional[MarketData] = None) -> PortfolioOptimizationResponse:
         """Optimize portfolio allocation using Modern Portfolio Theory"""
         try:
-            # Fetch historical data
-            data = await self._fetch_portfolio_data(symbols)
-            
-            # Calculate returns and covariance matrix
-            returns = data.pct_change().dropna()
-            mean_returns = returns.mean() * self.trading_days
-            cov_matrix = self._calculate_covariance_matrix(returns)
-            
-            # Set optimization objective based on risk tolerance
-            objective = self._get_optimization_objective(risk_tolerance)
+            if market_data is None:
+                market_data = await self.prepare_market_data(symbols)
+            mean_np, current_prices = market_data[2], market_data[4]
             
-            # Optimize portfolio
-            optimal_weights = await self._optimize_weights(
-                mean_returns, cov_matrix, objective, constraints or []
+            # Solve in a worker process while company info is fetched concurrently
+            loop = asyncio.get_running_loop()
+            result, company_infos = await asyncio.gather(
+                loop.run_in_executor(
+                    PROCESS_POOL, _optimize_in_worker, market_data, symbols, risk_tolerance, constraints or []
+                ),
+                asyncio.gather(*[self._get_company_info(symbol) for symbol in symbols])
             )
+            weights_np = result['weights']
+            risk_contribs = result['risk_contributions']
             
-            # Calculate portfolio metrics
-            portfolio_return = np.sum(optimal_weights * mean_returns)
-            portfolio_volatility = np.sqrt(np.dot(optimal_weights.T, np.dot(cov_matrix * self.trading_days, optimal_weights)))
-            sharpe_ratio = (portfolio_return - self.risk_free_rate) / portfolio_volatility
-            
-            # Get current prices for share calculations
-            current_prices = await self._get_current_prices(symbols)
-            
-            # Create allocation recommendations
+            # Create allocation recommendations (response models use model_construct and skip
+            # validation; numpy float64 values are floats and serialize directly)
             allocations = []
             for i, symbol in enumerate(symbols):
-                weight = optimal_weights[i]
+                weight = weights_np[i]
                 allocation_amount = investment_amount * weight
-                current_price = current_prices.get(symbol, 0)
+                current_price = current_prices[i]
                 shares = int(allocation_amount / current_price) if current_price > 0 else 0
+                company_info = company_infos[i]
                 
-                # Get company info
-                company_info = await self._get_company_info(symbol)
-                
-                allocations.append(AllocationRecommendation(
+                allocations.append(AllocationRecommendation.model_construct(
                     symbol=symbol,
                     company_name=company_info.get('name', symbol),
-                    recommended_weight=float(weight),
+                    recommended_weight=weight,
                     recommended_shares=shares,
-                    recommended_amount=float(allocation_amount),
-                    expected_return=float(mean_returns[i]),
-                    risk_contribution=float(self._calculate_risk_contribution(optimal_weights, cov_matrix, i)),
+                    recommended_amount=allocation_amount,
+                    expected_return=mean_np[i],
+                    risk_contribution=risk_contribs[i],
                     sector=company_info.get('sector', 'Unknown')
                 ))
             
-            # Calculate additional risk metrics
-            risk_metrics = RiskMetrics(
-                portfolio_volatility=float(portfolio_volatility),
-                value_at_risk_95=float(self._calculate_var(returns, optimal_weights)),
-                expected_return=float(portfolio_return),
-                sharpe_ratio=float(sharpe_ratio),
-                max_drawdown=float(self._calculate_max_drawdown(returns, optimal_weights)),
-                beta=float(self._calculate_portfolio_beta(returns, optimal_weights))
-            )
-            
-            # Generate rebalancing suggestions
-            rebalancing_suggestions = self._generate_rebalancing_suggestions(
-                optimal_weights, risk_tolerance
+            risk_metrics = RiskMetrics.model_construct(
+                portfolio_volatility=result['portfolio_volatility'],
+                value_at_risk_95=result['value_at_risk'],
+                expected_return=result['portfolio_return'],
+                sharpe_ratio=result['sharpe_ratio'],
+                max_drawdown=result['max_drawdown'],
+                beta=result['beta']
             )
             
-            # Calculate diversification score
-            diversification_score = self._calculate_diversification_score(optimal_weights)
-            
-            return PortfolioOptimizationResponse(
+            return PortfolioOptimizationResponse.model_construct(
                 allocations=allocations,
                 risk_metrics=risk_metrics,
                 total_investment=investment_amount,
-                expected_annual_return=float(portfolio_return),
-                optimization_score=float(sharpe_ratio),
-                rebalancing_suggestions=rebalancing_suggestions,
-                diversification_score=diversification_score,
+                expected_annual_return=result['portfolio_return'],
+                optimization_score=result['sharpe_ratio'],
+                rebalancing_suggestions=result['rebalancing_suggestions'],
+                diversification_score=result['diversification_score'],
                 generated_at=datetime.utcnow()
             )
-            
+        
         except Exception as e:
             logger.error(f"Portfolio optimization failed: {str(e)}")
             raise
     
-    async def _fetch_portfolio_data(self, symbols: List[str], period: str = "2y") -> pd.DataFrame:
-        """Fetch historical data for portfolio symbols"""
+    def optimize_numeric(self, market_data: MarketData, symbols: List[str], risk_tolerance: RiskTolerance,
+                         constraints: List[PortfolioConstraint]) -> Dict[str, Any]:
+        """CPU-bound part of optimize: solve for the weights and compute the portfolio metrics"""
+        returns_np, market_returns, mean_np, cov_matrix, _ = market_data
+        
+        # Set optimization objective based on risk tolerance
+        objective = self._get_optimization_objective(risk_tolerance)
+        
+        # Optimize portfolio
+        optimal_weights = self._optimize_weights(
+            pd.Series(mean_np, index=symbols), cov_matrix, objective, constraints
+        )
+        weights_np = np.ascontiguousarray(optimal_weights, dtype=np.float64)
+        
+        # Portfolio variance and every asset's risk contribution from a single matrix-vector product
+        marginal_contribs = cov_matrix @ weights_np
+        portfolio_variance = weights_np @ marginal_contribs
+        risk_contribs = weights_np * marginal_contribs / portfolio_variance
+        
+        # Calculate portfolio metrics
+        portfolio_return = weights_np @ mean_np
+        portfolio_volatility = np.sqrt(portfolio_variance * self.trading_days)
+        sharpe_ratio = (portfolio_return - self.risk_free_rate) / portfolio_volatility
+        
+        # Calculate additional risk metrics
+        value_at_risk, max_drawdown = self._calculate_risk_stats(returns_np, weights_np)
+        
+        return {
+            'weights': weights_np,
+            'risk_contributions': risk_contribs,
+            'portfolio_return': portfolio_return,
+            'portfolio_volatility': portfolio_volatility,
+            'sharpe_ratio': sharpe_ratio,
+            'value_at_risk': value_at_risk,
+            'max_drawdown': max_drawdown,
+            'beta': self._calculate_portfolio_beta(returns_np, weights_np, market_returns),
+            'rebalancing_suggestions': self._generate_rebalancing_suggestions(weights_np, risk_tolerance),
+            'diversification_score': self._calculate_diversification_score(weights_np)
+        }
+    
+    async def _fetch_portfolio_data(self, symbols: List[str], period: str = "2y",
+                                    optional: Tuple[str, ...] = ()) -> Tuple[np.ndarray, List[str], np.ndarray, np.ndarray]:
+        """Fetch daily returns and latest closes for portfolio symbols as (dates, columns, returns, closes)
+        (cached per symbol set and period); optional symbols without data are left out of columns"""
+        return await self._history_cache.get_or_set(
+            (tuple(symbols), period, optional), lambda: self._download_portfolio_data(symbols, period, optional)
+        )
+    
+    async def _download_portfolio_data(self, symbols: List[str], period: str,
+                                       optional: Tuple[str, ...] = ()) -> Tuple[np.ndarray, List[str], np.ndarray, np.ndarray]:
+        """Download historical closes for portfolio symbols and convert them to daily returns"""
         try:
-            data = yf.download(symbols, period=period, progress=False)['Adj Close']
+            session = self._get_session()
+            downloads = await asyncio.gather(
+                *[fetch_closes(session, symbol, range_=period) for symbol in symbols], return_exceptions=True
+            )
             
-            if isinstance(data, pd.Series):
-                data = data.to_frame(symbols[0])
+            columns, series = [], []
+            for symbol, download in zip(symbols, downloads):
+                if symbol in optional and (isinstance(download, BaseException) or np.isnan(download[1]).all()):
+                    logger.warning(f"No price history for {symbol}, leaving it out")
+                    continue
+                if isinstance(download, BaseException):
+                    raise download
+                columns.append(symbol)
+                series.append(download)
             
-            # Handle missing data
-            data = data.fillna(method='forward').fillna(method='backward')
+            # Align the symbols on the union of their trading days; days a symbol did not trade stay NaN
+            days = [timestamps // 86400 for timestamps, _ in series]
+            index = reduce(np.union1d, days)
             
-            return data
+            # Prices and returns are kept in float32: the 2y window is only ~500 rows, so the
+            # scalar risk metrics don't need double precision and the passes over this
+            # buffer move half the bytes. Results are widened to float64 where they feed
+            # the optimizer (covariance, mean returns).
+            prices = np.full((len(index), len(columns)), np.nan, dtype=np.float32)
+            for j, (day, (_, closes)) in enumerate(zip(days, series)):
+                prices[np.searchsorted(index, day), j] = closes
             
+            # Fill missing prices and compute returns in one pass over the raw array
+            returns = filled_returns(prices)
+            valid_rows = ~np.isnan(returns).any(axis=1)
+            
+            # The latest close of each symbol doubles as its current price for share counts
+            last_closes = np.array([
+                closes[~np.isnan(closes)][-1] if not np.isnan(closes).all() else 0.0
+                for _, closes in series
+            ])
+            
+            return index.astype('datetime64[D]')[1:][valid_rows], columns, returns[valid_rows], last_closes
+        
         except Exception as e:
             logger.error(f"Failed to fetch portfolio data: {str(e)}")
             raise
     
-    def _calculate_covariance_matrix(self, returns: pd.DataFrame) -> np.ndarray:
-        """Calculate covariance matrix using Ledoit-Wolf shrinkage"""
+    def _calculate_covariance_matrix(self, returns: np.ndarray, symbols: List[str]) -> np.ndarray:
+        """Calculate covariance matrix using Ledoit-Wolf shrinkage (memoized on the returns content)"""
+        key = (tuple(symbols), returns.shape[0], hashlib.blake2b(returns.tobytes(), digest_size=16).digest())
+        cov_matrix = self._covariance_cache.get(key)
+        if cov_matrix is not None:
+            return cov_matrix
+        
         try:
             # Use Ledoit-Wolf shrinkage for better covariance estimation
             lw = LedoitWolf()
             cov_matrix = lw.fit(returns).covariance_
-            return cov_matrix
         except Exception:
             # Fallback to sample covariance
-            return returns.cov().values
+            cov_matrix = np.cov(returns, rowvar=False)
+        
+        # Column-major matches the layout LAPACK/BLAS expect, so downstream solves skip a conversion
+        cov_matrix = np.asfortranarray(cov_matrix, dtype=np.float64)
+        self._covariance_cache.set(key, cov_matrix)
+        return cov_matrix
     
     def _get_optimization_objective(self, risk_tolerance: RiskTolerance) -> OptimizationObjective:
         """Get optimization objective based on risk tolerance"""
@@ -141,52 +293,72 @@ class PortfolioOptimizer:
         else:
             return OptimizationObjective.MAX_SHARPE
     
-    async def _optimize_weights(self, mean_returns: pd.Series, cov_matrix: np.ndarray,
-                               objective: OptimizationObjective, constraints: List[PortfolioConstraint]) -> np.ndarray:
+    def _optimize_weights(self, mean_returns: pd.Series, cov_matrix: np.ndarray,
+                          objective: OptimizationObjective, constraints: List[PortfolioConstraint]) -> np.ndarray:
         """Optimize portfolio weights"""
         n_assets = len(mean_returns)
         
         # Initial guess (equal weights)
         x0 = np.array([1/n_assets] * n_assets)
         
+        if objective == OptimizationObjective.EQUAL_WEIGHT:
+            return x0
+        
+        # Annualize once instead of inside every objective evaluation
+        cov_ann = np.empty_like(cov_matrix, order='F')
+        np.multiply(cov_matrix, self.trading_days, out=cov_ann)
+        mean_np = mean_returns.values
+        
+        # Bounds (0 <= weight <= 1), tightened by custom constraints
+        lower = np.zeros(n_assets)
+        upper = np.ones(n_assets)
+        sym_idx = {symbol: i for i, symbol in enumerate(mean_returns.index)}
+        for constraint in constraints:
+            if constraint.type not in ('max_weight', 'min_weight') or not constraint.symbol:
+                continue
+            idx = sym_idx.get(constraint.symbol)
+            if idx is None:
+                logger.warning(f"Symbol {constraint.symbol} not found in portfolio")
+            elif constraint.type == 'max_weight':
+                upper[idx] = min(upper[idx], constraint.value)
+            else:
+                lower[idx] = max(lower[idx], constraint.value)
+        
+        # Minimum risk and maximum Sharpe are convex QPs; solve them directly
+        try:
+            if objective == OptimizationObjective.MIN_RISK:
+                weights = self._min_variance_weights(cov_ann, lower, upper)
+            elif objective == OptimizationObjective.MAX_SHARPE:
+                weights = self._max_sharpe_weights(mean_np, cov_ann, lower, upper)
+            else:
+                weights = None
+            
+            if weights is not None:
+                return weights
+        except Exception as e:
+            logger.warning(f"QP solver failed, falling back to SLSQP: {str(e)}")
+        
         # Constraints
         constraints_list = [
             {'type': 'eq', 'fun': lambda x: np.sum(x) - 1}  # Weights sum to 1
         ]
+        bounds = tuple(zip(lower, upper))
         
-        # Add custom constraints
-        for constraint in constraints:
-            if constraint.type == 'max_weight' and constraint.symbol:
-                try:
-                    idx = mean_returns.index.get_loc(constraint.symbol)
-                    constraints_list.append({
-                        'type': 'ineq',
-                        'fun': lambda x, i=idx, val=constraint.value: val - x[i]
-                    })
-                except KeyError:
-                    logger.warning(f"Symbol {constraint.symbol} not found in portfolio")
-            elif constraint.type == 'min_weight' and constraint.symbol:
-                try:
-                    idx = mean_returns.index.get_loc(constraint.symbol)
-                    constraints_list.append({
-                        'type': 'ineq',
-                        'fun': lambda x, i=idx, val=constraint.value: x[i] - val
-                    })
-                except KeyError:
-                    logger.warning(f"Symbol {constraint.symbol} not found in portfolio")
-        
-        # Bounds (0 <= weight <= 1)
-        bounds = tuple((0, 1) for _ in range(n_assets))
-        
-        # Objective function
+        # Objective function and its gradient
         if objective == OptimizationObjective.MAX_RETURN:
-            objective_func = lambda x: -np.sum(x * mean_returns)
+            objective_func = lambda x: -float(x @ mean_np)
+            jac = lambda x: -mean_np
         elif objective == OptimizationObjective.MIN_RISK:
-            objective_func = lambda x: np.sqrt(np.dot(x.T, np.dot(cov_matrix * self.trading_days, x)))
-        elif objective == OptimizationObjective.MAX_SHARPE:
-            objective_func = lambda x: -(np.sum(x * mean_returns) - self.risk_free_rate) / np.sqrt(np.dot(x.T, np.dot(cov_matrix * self.trading_days, x)))
-        else:  # EQUAL_WEIGHT
-            return x0
+            objective_func = lambda x: float(np.sqrt(x @ cov_ann @ x))
+            jac = lambda x: (cov_ann @ x) / max(np.sqrt(x @ cov_ann @ x), 1e-12)
+        else:  # MAX_SHARPE
+            objective_func = lambda x: -(float(x @ mean_np) - self.risk_free_rate) / np.sqrt(x @ cov_ann @ x)
+            
+            def jac(x):
+                cov_x = cov_ann @ x
+                volatility = max(np.sqrt(x @ cov_x), 1e-12)
+                excess_return = x @ mean_np - self.risk_free_rate
+                return -(mean_np / volatility - excess_return * cov_x / volatility ** 3)
         
         # Optimize
         try:
@@ -194,6 +366,7 @@ class PortfolioOptimizer:
                 objective_func,
                 x0,
                 method='SLSQP',
+                jac=jac,
                 bounds=bounds,
                 constraints=constraints_list,
                 options={'maxiter': 1000}
@@ -204,88 +377,112 @@ class PortfolioOptimizer:
             else:
                 logger.warning("Optimization failed, using equal weights")
                 return x0
-                
+        
         except Exception as e:
             logger.error(f"Optimization error: {str(e)}")
             return x0
     
-    async def _get_current_prices(self, symbols: List[str]) -> Dict[str, float]:
-        """Get current prices for symbols"""
+    def _min_variance_weights(self, cov_ann: np.ndarray, lower: np.ndarray, upper: np.ndarray) -> Optional[np.ndarray]:
+        """Minimum-variance weights: closed form when no bound is active, otherwise a QP"""
+        n_assets = len(lower)
+        
+        # w = inv(cov) 1 / (1' inv(cov) 1) is optimal whenever it already satisfies the default bounds
+        if not lower.any() and (upper >= 1).all():
+            weights = np.linalg.solve(cov_ann, np.ones(n_assets))
+            weights /= weights.sum()
+            if (weights >= 0).all():
+                return weights
+        
+        w = cp.Variable(n_assets)
+        problem = cp.Problem(
+            cp.Minimize(cp.quad_form(w, cp.psd_wrap(cov_ann))),
+            [cp.sum(w) == 1, w >= lower, w <= upper]
+        )
+        problem.solve()
+        
+        if problem.status not in (cp.OPTIMAL, cp.OPTIMAL_INACCURATE):
+            return None
+        return self._clip_weights(w.value, lower, upper)
+    
+    def _max_sharpe_weights(self, mean_returns: np.ndarray, cov_ann: np.ndarray,
+                            lower: np.ndarray, upper: np.ndarray) -> Optional[np.ndarray]:
+        """Maximum-Sharpe weights via the homogenized QP: min y'Σy s.t. (mu - rf)'y = 1, w = y / sum(y)"""
+        excess_returns = mean_returns - self.risk_free_rate
+        if excess_returns.max() <= 0:
+            # No asset beats the risk-free rate, so the transformation does not apply
+            return None
+        
+        y = cp.Variable(len(mean_returns))
+        scale = cp.sum(y)
+        problem = cp.Problem(
+            cp.Minimize(cp.quad_form(y, cp.psd_wrap(cov_ann))),
+            [excess_returns @ y == 1, y >= 0, y >= scale * lower, y <= scale * upper]
+        )
+        problem.solve()
+        
+        if problem.status not in (cp.OPTIMAL, cp.OPTIMAL_INACCURATE):
+            return None
+        return self._clip_weights(y.value / y.value.sum(), lower, upper)
+    
+    def _clip_weights(self, weights: np.ndarray, lower: np.ndarray, upper: np.ndarray) -> np.ndarray:
+        """Remove solver round-off outside the bounds and re-normalize to sum to one"""
+        weights = np.clip(weights, lower, upper)
+        return weights / weights.sum()
+    
+    async def _get_crumb(self, session: aiohttp.ClientSession) -> str:
+        """Crumb for the session's Yahoo cookie, fetched once per session"""
+        async with self._crumb_lock:
+            if self._crumb is None:
+                self._crumb = await fetch_crumb(session)
+            return self._crumb
+    
+    async def _fetch_company_info(self, symbol: str) -> Dict[str, str]:
+        """Fetch company information from Yahoo Finance"""
+        session = self._get_session()
+        crumb = await self._get_crumb(session)
         try:
-            prices = {}
-            for symbol in symbols:
-                ticker = yf.Ticker(symbol)
-                hist = ticker.history(period="1d")
-                if not hist.empty:
-                    prices[symbol] = hist['Close'].iloc[-1]
-                else:
-                    prices[symbol] = 0.0
-            return prices
-        except Exception as e:
-            logger.error(f"Failed to get current prices: {str(e)}")
-            return {symbol: 0.0 for symbol in symbols}
+            return await fetch_company_info(session, symbol, crumb)
+        except aiohttp.ClientResponseError as e:
+            if e.status == 401:
+                # The cookie or crumb expired; the next lookup repeats the handshake
+                self._crumb = None
+            raise
     
     async def _get_company_info(self, symbol: str) -> Dict[str, str]:
         """Get company information"""
         try:
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
-            return {
-                'name': info.get('longName', symbol),
-                'sector': info.get('sector', 'Unknown')
-            }
-        except Exception:
-            return {'name': symbol, 'sector': 'Unknown'}
-    
-    def _calculate_risk_contribution(self, weights: np.ndarray, cov_matrix: np.ndarray, asset_idx: int) -> float:
-        """Calculate risk contribution of an asset"""
-        portfolio_variance = np.dot(weights.T, np.dot(cov_matrix, weights))
-        marginal_contrib = np.dot(cov_matrix, weights)[asset_idx]
-        risk_contrib = weights[asset_idx] * marginal_contrib / portfolio_variance
-        return risk_contrib
-    
-    def _calculate_var(self, returns: pd.DataFrame, weights: np.ndarray, confidence_level: float = 0.05) -> float:
-        """Calculate Value at Risk"""
-        try:
-            portfolio_returns = (returns * weights).sum(axis=1)
-            var = np.percentile(portfolio_returns, confidence_level * 100)
-            return abs(var)
-        except Exception:
-            return 0.05  # Default 5% VaR
+            return await self._info_cache.get_or_set(symbol, lambda: self._fetch_company_info(symbol))
+        except Exception as e:
+            logger.warning(f"Company info lookup failed for {symbol}: {str(e)}")
+            info = {'name': symbol, 'sector': 'Unknown'}
+            self._info_cache.set(symbol, info, ttl=COMPANY_INFO_RETRY_TTL)
+            return info
     
-    def _calculate_max_drawdown(self, returns: pd.DataFrame, weights: np.ndarray) -> float:
-        """Calculate maximum drawdown"""
+    def _calculate_risk_stats(self, returns: np.ndarray, weights: np.ndarray,
+                              confidence_level: float = 0.05) -> Tuple[float, float]:
+        """Calculate Value at Risk and maximum drawdown in one pass"""
         try:
-            portfolio_returns = (returns * weights).sum(axis=1)
-            cumulative = (1 + portfolio_returns).cumprod()
-            running_max = cumulative.expanding().max()
-            drawdown = (cumulative - running_max) / running_max
-            return abs(drawdown.min())
+            return risk_stats(returns, weights, confidence_level)
         except Exception:
-            return 0.1  # Default 10% max drawdown
+            return 0.05, 0.1  # Default 5% VaR, 10% max drawdown
     
-    def _calculate_portfolio_beta(self, returns: pd.DataFrame, weights: np.ndarray) -> float:
+    def _calculate_portfolio_beta(self, returns: np.ndarray, weights: np.ndarray,
+                                  market_returns: np.ndarray) -> float:
         """Calculate portfolio beta against market (using SPY as proxy)"""
         try:
-            # Fetch SPY data as market proxy
-            spy = yf.download('SPY', period='2y', progress=False)['Adj Close']
-            spy_returns = spy.pct_change().dropna()
-            
-            # Align dates
-            common_dates = returns.index.intersection(spy_returns.index)
-            if len(common_dates) < 50:  # Need sufficient data
+            # Returns and market returns come from the same download, so rows are already aligned
+            if len(market_returns) < 50:  # Need sufficient data
                 return 1.0
             
-            portfolio_returns = (returns.loc[common_dates] * weights).sum(axis=1)
-            market_returns = spy_returns.loc[common_dates]
+            portfolio_returns = returns @ weights
             
             # Calculate beta
-            covariance = np.cov(portfolio_returns, market_returns)[0, 1]
+            covariance = np.cov(portfolio_returns, market_returns, bias=True)[0, 1]
             market_variance = np.var(market_returns)
             
             beta = covariance / market_variance if market_variance > 0 else 1.0
             return beta
-            
+        
         except Exception:
             return 1.0  # Default beta
     
@@ -315,11 +512,33 @@ class PortfolioOptimizer:
     
     def _calculate_diversification_score(self, weights: np.ndarray) -> float:
         """Calculate diversification score (0-1, higher is better)"""
+        if len(weights) < 2:
+            return 0.0
+        
         # Use Herfindahl-Hirschman Index inverse
-        hhi = np.sum(weights ** 2)
+        concentration = hhi(weights)
         max_hhi = 1.0  # Completely concentrated
         min_hhi = 1.0 / len(weights)  # Equally weighted
         
         # Normalize to 0-1 scale
-        diversification_score = (max_hhi - hhi) / (max_hhi - min_hhi)
+        diversification_score = (max_hhi - concentration) / (max_hhi - min_hhi)
         return max(0.0, min(1.0, diversification_score))
+
+# Worker processes for the CPU-bound solve, so the event loop (and the GIL) stay free for I/O.
+# Workers are spawned rather than forked because the parent runs threads (executor, BLAS).
+# The spare cores are shared between the server workers.
+PROCESS_POOL = ProcessPoolExecutor(
+    max_workers=max(1, ((os.cpu_count() or 2) - 1) // web_concurrency()),
+    mp_context=multiprocessing.get_context('spawn')
+)
+
+_worker_optimizer: Optional[PortfolioOptimizer] = None
+
+def _optimize_in_worker(market_data: MarketData, symbols: List[str], risk_tolerance: RiskTolerance,
+                        constraints: List[PortfolioConstraint]) -> Dict[str, Any]:
+    """Process pool entry point; each worker builds (and warms up) its own optimizer once"""
+    global _worker_optimizer
+    if _worker_optimizer is None:
+        _worker_optimizer = PortfolioOptimizer()
+        _worker_optimizer.warmup_kernels()
+    return _worker_optimizer.optimize_numeric(market_data, symbols, risk_tolerance, constraints)
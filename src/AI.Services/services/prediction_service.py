@@ -1,10 +1,13 @@
+import asyncio
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 import pandas as pd
 import yfinance as yf
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 import logging
-from sklearn.ensemble import RandomForestRegressor
 from sklearn.linear_model import LinearRegression
 from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import mean_squared_error, r2_score
@@ -12,27 +15,108 @@ import tensorflow as tf
 from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import LSTM, Dense, Dropout
 from prophet import Prophet
-import ta
 import joblib
 import os
+import tempfile
+
+try:
+    # TA-Lib needs its C library installed; the pandas implementation is used without it
+    import talib
+except ImportError:
+    talib = None
 
 from models.prediction_models import PredictionResponse, PredictionPoint, ModelType
+from services._training import TRAINING_POOL, train_random_forest
+from utils.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+MODEL_DIR = "models/saved"
+MODEL_CACHE_SIZE = 128
+MARKET_TZ = ZoneInfo("America/New_York")
+LSTM_SEQUENCE_LENGTH = 60
+# Longest forecast a request may ask for (PredictionRequest.days_ahead)
+LSTM_MAX_HORIZON = 365
+
 class PredictionService:
     def __init__(self):
         self.models = {}
         self.scalers = {}
-        self.model_cache = {}
-        
+        # Fitted models keyed by (symbol, model type, last bar timestamp, row count), least recently used first
+        self.model_cache: OrderedDict = OrderedDict()
+        # TFLite interpreters, keyed like model_cache and evicted with it
+        self._rollouts: Dict[Tuple, Any] = {}
+        # Serving copy of the LSTM and its compiled functions, built once in initialize()
+        self._lstm_template = None
+        self._lstm_forward = None
+        self._lstm_rollout = None
+        # Held while a symbol's weights are loaded into the template and its rollout runs
+        self._lstm_lock = asyncio.Lock()
+        self._data_cache = TTLCache(ttl=3600)
+        # Background writes of freshly fitted models to MODEL_DIR
+        self._pending_saves: Set[asyncio.Task] = set()
+
     async def initialize(self):
         """Initialize the prediction service"""
         logger.info("Initializing Prediction Service...")
         # Create models directory if it doesn't exist
-        os.makedirs("models/saved", exist_ok=True)
+        os.makedirs(MODEL_DIR, exist_ok=True)
+        self._load_saved_models()
+        
+        # One LSTM graph for serving; each symbol's weights are loaded into it before its rollout,
+        # so forecasting never rebuilds or retraces the architecture
+        self._lstm_template = self._build_lstm(LSTM_SEQUENCE_LENGTH)
+        self._lstm_forward = tf.function(
+            lambda window: self._lstm_template(window, training=False)
+        ).get_concrete_function(tf.TensorSpec((1, LSTM_SEQUENCE_LENGTH, 1), tf.float32))
+        self._lstm_rollout = self._build_lstm_rollout(self._lstm_template)
         logger.info("Prediction Service initialized successfully")
     
+    def _load_saved_models(self):
+        """Reload models persisted by earlier processes into the model cache"""
+        for filename in sorted(os.listdir(MODEL_DIR)):
+            if not filename.endswith('.joblib'):
+                continue
+            try:
+                saved = joblib.load(os.path.join(MODEL_DIR, filename))
+                self._remember_model(saved['key'], saved['model'], saved['scaler'])
+            except Exception as e:
+                logger.warning(f"Failed to load saved model {filename}: {str(e)}")
+    
+    def _model_key(self, data: pd.DataFrame, symbol: str, model_type: ModelType) -> Tuple:
+        """Cache key identifying a model fitted on this exact data"""
+        return (symbol, model_type.value, data.index[-1].value, len(data))
+    
+    def _get_cached_model(self, key: Tuple) -> Optional[Tuple[Any, Any]]:
+        """Return the cached (model, scaler) for key, if any"""
+        entry = self.model_cache.get(key)
+        if entry is not None:
+            self.model_cache.move_to_end(key)
+        return entry
+    
+    def _latest_model(self, symbol: str, model_type: ModelType) -> Optional[Any]:
+        """Most recently trained cached model for a symbol and model type, regardless of data snapshot"""
+        keys = [key for key in self.model_cache if key[0] == symbol and key[1] == model_type.value]
+        if not keys:
+            return None
+        return self.model_cache[max(keys, key=lambda key: key[2])][0]
+    
+    def _remember_model(self, key: Tuple, model: Any, scaler: Any = None):
+        """Add a fitted model to the LRU cache, evicting the least recently used beyond the cap"""
+        self.model_cache[key] = (model, scaler)
+        self.model_cache.move_to_end(key)
+        while len(self.model_cache) > MODEL_CACHE_SIZE:
+            evicted, _ = self.model_cache.popitem(last=False)
+            self._rollouts.pop(evicted, None)
+    
+    def _cache_model(self, key: Tuple, model: Any, scaler: Any = None):
+        """Cache a freshly fitted model and persist it in the background so it survives restarts"""
+        self._remember_model(key, model, scaler)
+        # Pickling and compressing a fitted model takes up to seconds; keep it off the event loop
+        task = asyncio.create_task(asyncio.to_thread(_save_model, key, model, scaler))
+        self._pending_saves.add(task)
+        task.add_done_callback(self._pending_saves.discard)
+    
     async def predict_price(self, symbol: str, days_ahead: int, model_type: str) -> PredictionResponse:
         """Predict stock price using specified model"""
         try:
@@ -51,16 +135,22 @@ class PredictionService:
                 prediction = await self._linear_regression_predict(data, symbol, days_ahead)
             
             return prediction
-            
+        
         except Exception as e:
             logger.error(f"Prediction failed for {symbol}: {str(e)}")
             raise
     
     async def _fetch_stock_data(self, symbol: str, period: str = "2y") -> pd.DataFrame:
-        """Fetch stock data from Yahoo Finance"""
+        """Fetch stock data from Yahoo Finance (cached per symbol and period; concurrent misses share one download)"""
+        return await self._data_cache.get_or_set(
+            (symbol, period), lambda: self._download_stock_data(symbol, period), ttl=self._data_ttl()
+        )
+    
+    async def _download_stock_data(self, symbol: str, period: str) -> pd.DataFrame:
+        """Download stock data and add technical indicators"""
         try:
             ticker = yf.Ticker(symbol)
-            data = ticker.history(period=period)
+            data = await asyncio.get_running_loop().run_in_executor(None, lambda: ticker.history(period=period))
             
             if data.empty:
                 raise ValueError(f"No data found for symbol {symbol}")
@@ -69,37 +159,79 @@ class PredictionService:
             data = self._add_technical_indicators(data)
             
             return data
-            
+        
         except Exception as e:
             logger.error(f"Failed to fetch data for {symbol}: {str(e)}")
             raise
     
+    def _data_ttl(self) -> float:
+        """Refresh price history every 10 minutes while the US market is open, hourly otherwise"""
+        now = datetime.now(MARKET_TZ)
+        market_open = now.weekday() < 5 and time(9, 30) <= now.time() < time(16, 0)
+        return 600 if market_open else 3600
+
     def _add_technical_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
         """Add technical indicators to the data"""
+        if talib is not None:
+            return self._add_talib_indicators(data)
+        return self._add_pandas_indicators(data)
+    
+    def _add_pandas_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Add technical indicators using vectorized pandas operations"""
+        close = data['Close']
+        rolling_20 = close.rolling(window=20)
+        
         # Moving averages
-        data['SMA_20'] = ta.trend.sma_indicator(data['Close'], window=20)
-        data['SMA_50'] = ta.trend.sma_indicator(data['Close'], window=50)
-        data['EMA_12'] = ta.trend.ema_indicator(data['Close'], window=12)
-        data['EMA_26'] = ta.trend.ema_indicator(data['Close'], window=26)
+        data['SMA_20'] = rolling_20.mean()
+        data['SMA_50'] = close.rolling(window=50).mean()
+        data['EMA_12'] = close.ewm(span=12, min_periods=12, adjust=False).mean()
+        data['EMA_26'] = close.ewm(span=26, min_periods=26, adjust=False).mean()
         
-        # RSI
-        data['RSI'] = ta.momentum.rsi(data['Close'])
+        # RSI (Wilder's smoothing over 14 periods)
+        delta = close.diff()
+        avg_gain = delta.where(delta > 0, 0.0).ewm(alpha=1 / 14, min_periods=14, adjust=False).mean()
+        avg_loss = (-delta).where(delta < 0, 0.0).ewm(alpha=1 / 14, min_periods=14, adjust=False).mean()
+        data['RSI'] = np.where(avg_loss == 0, 100, 100 - 100 / (1 + avg_gain / avg_loss))
         
-        # MACD
-        data['MACD'] = ta.trend.macd_diff(data['Close'])
+        # MACD histogram
+        macd = data['EMA_12'] - data['EMA_26']
+        data['MACD'] = macd - macd.ewm(span=9, min_periods=9, adjust=False).mean()
         
         # Bollinger Bands
-        bb = ta.volatility.BollingerBands(data['Close'])
-        data['BB_upper'] = bb.bollinger_hband()
-        data['BB_lower'] = bb.bollinger_lband()
-        data['BB_middle'] = bb.bollinger_mavg()
+        std_20 = rolling_20.std(ddof=0)
+        data['BB_middle'] = data['SMA_20']
+        data['BB_upper'] = data['BB_middle'] + 2 * std_20
+        data['BB_lower'] = data['BB_middle'] - 2 * std_20
         
         # Volume indicators
-        data['Volume_SMA'] = ta.volume.volume_sma(data['Close'], data['Volume'])
+        data['Volume_SMA'] = data['Volume'].rolling(window=20).mean()
         
         # Price changes
-        data['Price_Change'] = data['Close'].pct_change()
-        data['Price_Change_5d'] = data['Close'].pct_change(5)
+        data['Price_Change'] = close.pct_change()
+        data['Price_Change_5d'] = close.pct_change(5)
+        
+        return data
+    
+    def _add_talib_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Add the same technical indicators using TA-Lib's C implementations"""
+        close = data['Close'].to_numpy(np.float64)
+        volume = data['Volume'].to_numpy(np.float64)
+        
+        data['SMA_20'] = talib.SMA(close, timeperiod=20)
+        data['SMA_50'] = talib.SMA(close, timeperiod=50)
+        data['EMA_12'] = talib.EMA(close, timeperiod=12)
+        data['EMA_26'] = talib.EMA(close, timeperiod=26)
+        data['RSI'] = talib.RSI(close, timeperiod=14)
+        data['MACD'] = talib.MACD(close, fastperiod=12, slowperiod=26, signalperiod=9)[2]
+        
+        upper, middle, lower = talib.BBANDS(close, timeperiod=20, nbdevup=2, nbdevdn=2)
+        data['BB_upper'] = upper
+        data['BB_lower'] = lower
+        data['BB_middle'] = middle
+        
+        data['Volume_SMA'] = talib.SMA(volume, timeperiod=20)
+        data['Price_Change'] = talib.ROCP(close, timeperiod=1)
+        data['Price_Change_5d'] = talib.ROCP(close, timeperiod=5)
         
         return data
     
@@ -108,53 +240,71 @@ class PredictionService:
         try:
             # Prepare data for LSTM
             features = ['Close', 'Volume', 'SMA_20', 'SMA_50', 'RSI', 'MACD']
-            df = data[features].dropna()
-            
-            # Scale the data
-            scaler = StandardScaler()
-            scaled_data = scaler.fit_transform(df)
-            
-            # Create sequences
-            sequence_length = 60
-            X, y = self._create_sequences(scaled_data[:, 0], sequence_length)
-            
-            # Split data
-            train_size = int(len(X) * 0.8)
-            X_train, X_test = X[:train_size], X[train_size:]
-            y_train, y_test = y[:train_size], y[train_size:]
-            
-            # Build LSTM model
-            model = Sequential([
-                LSTM(50, return_sequences=True, input_shape=(sequence_length, 1)),
-                Dropout(0.2),
-                LSTM(50, return_sequences=False),
-                Dropout(0.2),
-                Dense(25),
-                Dense(1)
-            ])
-            
-            model.compile(optimizer='adam', loss='mean_squared_error')
-            
-            # Train model
-            model.fit(X_train, y_train, batch_size=32, epochs=50, verbose=0)
-            
-            # Make predictions
-            predictions = []
-            current_sequence = scaled_data[-sequence_length:, 0].reshape(1, sequence_length, 1)
-            
-            for _ in range(days_ahead):
-                pred = model.predict(current_sequence, verbose=0)[0, 0]
-                predictions.append(pred)
+            # The model doesn't need double precision; float32 halves the bytes every training pass moves
+            df = data[features].dropna().astype(np.float32)
+            sequence_length = LSTM_SEQUENCE_LENGTH
+            
+            key = self._model_key(data, symbol, ModelType.LSTM)
+            tflite_key = (symbol, 'lstm_tflite') + key[2:]
+            cached = self._get_cached_model(key)
+            if cached is not None:
+                model, scaler = cached
+                scaled_data = scaler.transform(df)
+            else:
+                # Scale the data
+                scaler = StandardScaler()
+                scaled_data = scaler.fit_transform(df)
                 
-                # Update sequence
-                current_sequence = np.roll(current_sequence, -1)
-                current_sequence[0, -1, 0] = pred
-            
-            # Inverse transform predictions
-            predictions = scaler.inverse_transform(
-                np.column_stack([predictions, np.zeros((len(predictions), scaled_data.shape[1] - 1))])
-            )[:, 0]
+                # Create sequences
+                X, y = self._create_sequences(scaled_data[:, 0], sequence_length)
+                
+                # Split data
+                train_size = int(len(X) * 0.8)
+                X_train, X_test = X[:train_size], X[train_size:]
+                y_train, y_test = y[:train_size], y[train_size:]
+                
+                # Build LSTM model
+                model = self._build_lstm(sequence_length)
+                
+                # XLA fuses the LSTM cell ops; ask for it explicitly rather than relying on auto-clustering
+                model.compile(optimizer='adam', loss='mean_squared_error', jit_compile=True)
+                
+                # Stage the training set once; Keras would re-convert the numpy arrays every epoch
+                dataset = (
+                    tf.data.Dataset.from_tensor_slices((X_train, y_train))
+                    .cache()
+                    .shuffle(1024)
+                    .batch(32)
+                    .prefetch(tf.data.AUTOTUNE)
+                )
+                
+                # Train model (TensorFlow releases the GIL, so a thread is enough)
+                await asyncio.get_running_loop().run_in_executor(
+                    None, lambda: model.fit(dataset, epochs=50, verbose=0)
+                )
+                self._cache_model(key, model, scaler)
+                
+                # Quantized copy for serving the rollout
+                try:
+                    tflite_model = await asyncio.get_running_loop().run_in_executor(
+                        None, self._quantize_lstm, model, X_train
+                    )
+                    self._cache_model(tflite_key, tflite_model)
+                except Exception as e:
+                    logger.warning(f"LSTM int8 conversion failed for {symbol}: {str(e)}")
+            
+            # Make predictions, preferring the int8 model and then one compiled call for the whole rollout
+            seed = scaled_data[-sequence_length:, 0]
+            cached_tflite = self._get_cached_model(tflite_key)
+            if cached_tflite is not None:
+                predictions = self._tflite_rollout(tflite_key, cached_tflite[0], seed, days_ahead)
+            else:
+                async with self._lstm_lock:
+                    predictions = await asyncio.to_thread(self._run_lstm_rollout, model, seed, days_ahead)
             
+            # Inverse transform predictions (only the Close column's mean and scale are needed)
+            predictions = np.asarray(predictions, np.float32) * scaler.scale_[0] + scaler.mean_[0]
+
             # Create prediction points
             prediction_points = []
             start_date = data.index[-1] + timedelta(days=1)
@@ -162,7 +312,7 @@ class PredictionService:
             for i, pred_price in enumerate(predictions):
                 confidence = max(0.6, 1.0 - (i * 0.01))  # Decreasing confidence over time
                 
-                prediction_points.append(PredictionPoint(
+                prediction_points.append(PredictionPoint.model_construct(
                     date=start_date + timedelta(days=i),
                     predicted_price=float(pred_price),
                     confidence_interval_lower=float(pred_price * 0.95),
@@ -184,7 +334,7 @@ class PredictionService:
                 recommendation=recommendation,
                 generated_at=datetime.utcnow()
             )
-            
+        
         except Exception as e:
             logger.error(f"LSTM prediction failed: {str(e)}")
             raise
@@ -196,15 +346,27 @@ class PredictionService:
             df = data.reset_index()
             df = df.rename(columns={'Date': 'ds', 'Close': 'y'})
             
-            # Create and fit model
-            model = Prophet(
-                daily_seasonality=False,
-                weekly_seasonality=True,
-                yearly_seasonality=True,
-                changepoint_prior_scale=0.05
-            )
+            # Only fit the seasonal terms the horizon actually extrapolates into
+            yearly_seasonality = days_ahead > 90
+            weekly_seasonality = days_ahead > 5
             
-            model.fit(df[['ds', 'y']])
+            key = self._model_key(data, symbol, ModelType.PROPHET) + (yearly_seasonality, weekly_seasonality)
+            cached = self._get_cached_model(key)
+            if cached is not None:
+                model = cached[0]
+            else:
+                # Create and fit model
+                model = Prophet(
+                    daily_seasonality=False,
+                    weekly_seasonality=weekly_seasonality,
+                    yearly_seasonality=yearly_seasonality,
+                    changepoint_prior_scale=0.05,
+                    uncertainty_samples=200,
+                    stan_backend='CMDSTANPY'
+                )
+
+                await asyncio.get_running_loop().run_in_executor(None, model.fit, df[['ds', 'y']])
+                self._cache_model(key, model)
             
             # Make future dataframe
             future = model.make_future_dataframe(periods=days_ahead)
@@ -214,17 +376,22 @@ class PredictionService:
             predictions = forecast.tail(days_ahead)
             
             # Create prediction points
-            prediction_points = []
-            for _, row in predictions.iterrows():
-                confidence = 0.8  # Prophet provides good confidence intervals
-                
-                prediction_points.append(PredictionPoint(
-                    date=row['ds'],
-                    predicted_price=float(row['yhat']),
-                    confidence_interval_lower=float(row['yhat_lower']),
-                    confidence_interval_upper=float(row['yhat_upper']),
+            confidence = 0.8  # Prophet provides good confidence intervals
+            prediction_points = [
+                PredictionPoint.model_construct(
+                    date=pd.Timestamp(date),
+                    predicted_price=float(yhat),
+                    confidence_interval_lower=float(lower),
+                    confidence_interval_upper=float(upper),
                     confidence_score=confidence
-                ))
+                )
+                for date, yhat, lower, upper in zip(
+                    predictions['ds'].to_numpy(),
+                    predictions['yhat'].to_numpy(),
+                    predictions['yhat_lower'].to_numpy(),
+                    predictions['yhat_upper'].to_numpy()
+                )
+            ]
             
             # Calculate trend and recommendation
             trend = "bullish" if predictions['yhat'].iloc[-1] > data['Close'].iloc[-1] else "bearish"
@@ -240,7 +407,7 @@ class PredictionService:
                 recommendation=recommendation,
                 generated_at=datetime.utcnow()
             )
-            
+        
         except Exception as e:
             logger.error(f"Prophet prediction failed: {str(e)}")
             raise
@@ -252,7 +419,8 @@ class PredictionService:
             features = ['SMA_20', 'SMA_50', 'RSI', 'MACD', 'Volume', 'Price_Change']
             df = data[features + ['Close']].dropna()
             
-            X = df[features]
+            # float32 features (what the forest uses internally); prices stay float64
+            X = df[features].astype(np.float32)
             y = df['Close']
             
             # Split data
@@ -260,20 +428,30 @@ class PredictionService:
             X_train, X_test = X[:train_size], X[train_size:]
             y_train, y_test = y[:train_size], y[train_size:]
             
-            # Train model
-            model = RandomForestRegressor(n_estimators=100, random_state=42)
-            model.fit(X_train, y_train)
-            
-            # Make predictions
-            predictions = []
-            last_features = X.iloc[-1].values.reshape(1, -1)
-            
-            for i in range(days_ahead):
-                pred = model.predict(last_features)[0]
-                predictions.append(pred)
-                
-                # Update features (simplified approach)
-                last_features[0, -1] = (pred - y.iloc[-1]) / y.iloc[-1]  # Update price change
+            key = self._model_key(data, symbol, ModelType.RANDOM_FOREST)
+            cached = self._get_cached_model(key)
+            if cached is not None:
+                model = cached[0]
+            else:
+                # Train model in a separate process to keep sklearn's Python-level work off the GIL,
+                # growing the previous forest for this symbol when there is one
+                previous = self._latest_model(symbol, ModelType.RANDOM_FOREST)
+                model = await asyncio.get_running_loop().run_in_executor(
+                    TRAINING_POOL, train_random_forest, X_train, y_train, previous
+                )
+                self._cache_model(key, model)
+            
+            # Make predictions: build every future feature row at once from a linearly extrapolated
+            # close path (volume held at its last value), then score the whole horizon in one call
+            recent_close = y.to_numpy()[-20:]
+            slope = np.polyfit(np.arange(len(recent_close)), recent_close, 1)[0]
+            future_close = y.iloc[-1] + slope * np.arange(1, days_ahead + 1)
+            extended = pd.DataFrame({
+                'Close': np.concatenate([data['Close'].to_numpy(), future_close]),
+                'Volume': np.concatenate([data['Volume'].to_numpy(), np.full(days_ahead, data['Volume'].iloc[-1])])
+            })
+            future_features = self._add_technical_indicators(extended)[features].iloc[-days_ahead:].astype(np.float32)
+            predictions = model.predict(future_features)
             
             # Create prediction points
             prediction_points = []
@@ -282,7 +460,7 @@ class PredictionService:
             for i, pred_price in enumerate(predictions):
                 confidence = max(0.7, 1.0 - (i * 0.015))
                 
-                prediction_points.append(PredictionPoint(
+                prediction_points.append(PredictionPoint.model_construct(
                     date=start_date + timedelta(days=i),
                     predicted_price=float(pred_price),
                     confidence_interval_lower=float(pred_price * 0.92),
@@ -304,7 +482,7 @@ class PredictionService:
                 recommendation=recommendation,
                 generated_at=datetime.utcnow()
             )
-            
+        
         except Exception as e:
             logger.error(f"Random Forest prediction failed: {str(e)}")
             raise
@@ -331,7 +509,7 @@ class PredictionService:
             for i, pred_price in enumerate(predictions):
                 confidence = max(0.5, 0.8 - (i * 0.02))
                 
-                prediction_points.append(PredictionPoint(
+                prediction_points.append(PredictionPoint.model_construct(
                     date=start_date + timedelta(days=i),
                     predicted_price=float(pred_price),
                     confidence_interval_lower=float(pred_price * 0.9),
@@ -353,7 +531,7 @@ class PredictionService:
                 recommendation=recommendation,
                 generated_at=datetime.utcnow()
             )
-            
+        
         except Exception as e:
             logger.error(f"Linear regression prediction failed: {str(e)}")
             raise
@@ -361,44 +539,42 @@ class PredictionService:
     async def _ensemble_predict(self, data: pd.DataFrame, symbol: str, days_ahead: int) -> PredictionResponse:
         """Ensemble prediction combining multiple models"""
         try:
-            # Get predictions from different models
-            lstm_pred = await self._lstm_predict(data, symbol, days_ahead)
-            prophet_pred = await self._prophet_predict(data, symbol, days_ahead)
-            rf_pred = await self._random_forest_predict(data, symbol, days_ahead)
-            
-            # Combine predictions with weights
-            weights = {'lstm': 0.4, 'prophet': 0.35, 'rf': 0.25}
+            # Get predictions from different models, training them concurrently
+            lstm_pred, prophet_pred, rf_pred = await asyncio.gather(
+                self._lstm_predict(data, symbol, days_ahead),
+                self._prophet_predict(data, symbol, days_ahead),
+                self._random_forest_predict(data, symbol, days_ahead)
+            )
             
-            prediction_points = []
-            for i in range(days_ahead):
-                ensemble_price = (
-                    weights['lstm'] * lstm_pred.predictions[i].predicted_price +
-                    weights['prophet'] * prophet_pred.predictions[i].predicted_price +
-                    weights['rf'] * rf_pred.predictions[i].predicted_price
+            # Combine predictions with weights (lstm, prophet, rf) as one matrix product per field
+            weights = np.array([0.4, 0.35, 0.25])
+            base_predictions = (lstm_pred, prophet_pred, rf_pred)
+            prices = np.array([[p.predicted_price for p in pred.predictions[:days_ahead]] for pred in base_predictions])
+            confidences = np.array([[p.confidence_score for p in pred.predictions[:days_ahead]] for pred in base_predictions])
+            
+            ensemble_prices = weights @ prices
+            ensemble_confidences = weights @ confidences
+            
+            prediction_points = [
+                PredictionPoint.model_construct(
+                    date=point.date,
+                    predicted_price=price,
+                    confidence_interval_lower=lower,
+                    confidence_interval_upper=upper,
+                    confidence_score=confidence
                 )
-                
-                ensemble_confidence = (
-                    weights['lstm'] * lstm_pred.predictions[i].confidence_score +
-                    weights['prophet'] * prophet_pred.predictions[i].confidence_score +
-                    weights['rf'] * rf_pred.predictions[i].confidence_score
+                for point, price, lower, upper, confidence in zip(
+                    lstm_pred.predictions, ensemble_prices.tolist(), (ensemble_prices * 0.93).tolist(),
+                    (ensemble_prices * 1.07).tolist(), ensemble_confidences.tolist()
                 )
-                
-                prediction_points.append(PredictionPoint(
-                    date=lstm_pred.predictions[i].date,
-                    predicted_price=ensemble_price,
-                    confidence_interval_lower=ensemble_price * 0.93,
-                    confidence_interval_upper=ensemble_price * 1.07,
-                    confidence_score=ensemble_confidence
-                ))
+            ]
             
             # Determine overall trend
             trend_votes = [lstm_pred.trend, prophet_pred.trend, rf_pred.trend]
             trend = max(set(trend_votes), key=trend_votes.count)
             
             # Generate recommendation
-            recommendation = self._generate_recommendation_signal(
-                data, [p.predicted_price for p in prediction_points]
-            )
+            recommendation = self._generate_recommendation_signal(data, ensemble_prices.tolist())
             
             return PredictionResponse(
                 symbol=symbol,
@@ -410,23 +586,102 @@ class PredictionService:
                 recommendation=recommendation,
                 generated_at=datetime.utcnow()
             )
-            
+        
         except Exception as e:
             logger.error(f"Ensemble prediction failed: {str(e)}")
             raise
     
+    def _build_lstm(self, sequence_length: int) -> Sequential:
+        """LSTM architecture shared by training and the serving template"""
+        return Sequential([
+            LSTM(50, return_sequences=True, input_shape=(sequence_length, 1)),
+            Dropout(0.2),
+            LSTM(50, return_sequences=False),
+            Dropout(0.2),
+            Dense(25),
+            Dense(1)
+        ])
+    
+    def _build_lstm_rollout(self, template: Any):
+        """Autoregressive rollout of the serving template as one XLA-compiled concrete function. The horizon
+        is a traced argument and the output buffer is sized for the longest one, so XLA compiles it once."""
+        @tf.function(jit_compile=True)
+        def rollout(seed, days_ahead):
+            predictions = tf.TensorArray(tf.float32, size=LSTM_MAX_HORIZON, element_shape=())
+            state = seed
+            for i in tf.range(days_ahead):
+                pred = template(state, training=False)[0, 0]
+                predictions = predictions.write(i, pred)
+                # Drop the oldest step and append the prediction
+                state = tf.concat([state[:, 1:, :], tf.reshape(pred, (1, 1, 1))], axis=1)
+            return predictions.stack()
+        
+        return rollout.get_concrete_function(
+            tf.TensorSpec((1, LSTM_SEQUENCE_LENGTH, 1), tf.float32), tf.TensorSpec((), tf.int32)
+        )
+    
+    def _run_lstm_rollout(self, model: Any, seed: np.ndarray, days_ahead: int) -> np.ndarray:
+        """Load the model's weights into the serving template and roll it out (runs on a worker thread)"""
+        self._lstm_template.set_weights(model.get_weights())
+        window = tf.constant(seed.reshape(1, LSTM_SEQUENCE_LENGTH, 1), tf.float32)
+        try:
+            return self._lstm_rollout(window, tf.constant(days_ahead, tf.int32)).numpy()[:days_ahead]
+        except Exception as e:
+            logger.warning(f"Compiled LSTM rollout failed, stepping one day at a time: {str(e)}")
+            return self._step_rollout(
+                lambda current: self._lstm_forward(tf.constant(current)).numpy()[0, 0], seed, days_ahead
+            )
+    
+    def _quantize_lstm(self, model: Any, X_train: np.ndarray) -> bytes:
+        """Convert a trained LSTM to an int8 TFLite model, calibrated on training windows"""
+        converter = tf.lite.TFLiteConverter.from_keras_model(model)
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = lambda: ((window[None],) for window in X_train[:100])
+        return converter.convert()
+    
+    def _tflite_rollout(self, key: Tuple, tflite_model: bytes, seed: np.ndarray, days_ahead: int) -> np.ndarray:
+        """Roll the quantized LSTM forward with the TFLite interpreter (one interpreter per cached model)"""
+        interpreter = self._rollouts.get(key)
+        if interpreter is None:
+            interpreter = tf.lite.Interpreter(model_content=tflite_model, num_threads=os.cpu_count())
+            interpreter.allocate_tensors()
+            self._rollouts[key] = interpreter
+        
+        input_index = interpreter.get_input_details()[0]['index']
+        output_index = interpreter.get_output_details()[0]['index']
+        
+        def step(window):
+            interpreter.set_tensor(input_index, window)
+            interpreter.invoke()
+            return interpreter.get_tensor(output_index)[0, 0]
+        
+        return self._step_rollout(step, seed, days_ahead)
+    
+    def _step_rollout(self, step: Callable[[np.ndarray], float], seed: np.ndarray, days_ahead: int) -> np.ndarray:
+        """Roll a one-step model forward a day at a time, shifting a single window buffer in place"""
+        sequence = seed.astype(np.float32)
+        predictions = np.empty(days_ahead, dtype=np.float32)
+        for i in range(days_ahead):
+            pred = step(sequence.reshape(1, -1, 1))
+            predictions[i] = pred
+            
+            # Update sequence
+            sequence[:-1] = sequence[1:]
+            sequence[-1] = pred
+        return predictions
+    
     def _create_sequences(self, data: np.ndarray, sequence_length: int):
         """Create sequences for LSTM training"""
-        X, y = [], []
-        for i in range(sequence_length, len(data)):
-            X.append(data[i-sequence_length:i])
-            y.append(data[i])
-        return np.array(X).reshape(-1, sequence_length, 1), np.array(y)
+        # Every window is a strided view of data; only the float32 cast copies
+        windows = sliding_window_view(data, sequence_length)
+        X = windows[:-1][..., None].astype(np.float32, copy=False)
+        y = data[sequence_length:].astype(np.float32, copy=False)
+        return X, y
     
     def _generate_recommendation_signal(self, data: pd.DataFrame, predictions: List[float]) -> str:
         """Generate buy/sell/hold recommendation"""
         current_price = data['Close'].iloc[-1]
-        predicted_price = predictions[-1] if predictions else current_price
+        predicted_price = predictions[-1] if len(predictions) else current_price
         
         # Calculate percentage change
         price_change = (predicted_price - current_price) / current_price
@@ -448,20 +703,25 @@ class PredictionService:
         # For now, return mock trending predictions
         trending_symbols = ['AAPL', 'GOOGL', 'MSFT', 'TSLA', 'AMZN', 'NVDA', 'META', 'NFLX']
         
+        symbols = trending_symbols[:limit]
+        results = await asyncio.gather(
+            *[self.predict_price(symbol, 7, ModelType.ENSEMBLE) for symbol in symbols],
+            return_exceptions=True
+        )
+        
         trending_predictions = []
-        for symbol in trending_symbols[:limit]:
-            try:
-                prediction = await self.predict_price(symbol, 7, ModelType.ENSEMBLE)
-                trending_predictions.append({
-                    'symbol': symbol,
-                    'current_price': prediction.current_price,
-                    'predicted_price_7d': prediction.predictions[-1].predicted_price,
-                    'trend': prediction.trend,
-                    'recommendation': prediction.recommendation
-                })
-            except Exception as e:
-                logger.warning(f"Failed to get prediction for {symbol}: {str(e)}")
+        for symbol, prediction in zip(symbols, results):
+            if isinstance(prediction, Exception):
+                logger.warning(f"Failed to get prediction for {symbol}: {str(prediction)}")
                 continue
+            
+            trending_predictions.append({
+                'symbol': symbol,
+                'current_price': prediction.current_price,
+                'predicted_price_7d': prediction.predictions[-1].predicted_price,
+                'trend': prediction.trend,
+                'recommendation': prediction.recommendation
+            })
         
         return trending_predictions
     
@@ -548,3 +808,21 @@ class PredictionService:
             reasoning_parts.append("Mixed signals across all factors")
         
         return ". ".join(reasoning_parts) + "."
+
+
+def _save_model(key: Tuple, model: Any, scaler: Any):
+    """Write a fitted model to MODEL_DIR (runs on a worker thread). The dump goes to a temporary file
+    that is renamed into place, so a restart never loads a truncated pickle."""
+    symbol, model_type = key[0], key[1]
+    path = os.path.join(MODEL_DIR, f"{symbol}_{model_type}.joblib")
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=MODEL_DIR, suffix='.tmp')
+        os.close(fd)
+        try:
+            joblib.dump({'key': key, 'model': model, 'scaler': scaler}, tmp_path, compress=3)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except Exception as e:
+        logger.warning(f"Failed to save {model_type} model for {symbol}: {str(e)}")
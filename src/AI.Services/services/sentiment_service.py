@@ -1,23 +1,79 @@
 import asyncio
 import aiohttp
 import logging
+import os
+import shutil
+import tempfile
+from functools import lru_cache
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import pandas as pd
 import numpy as np
-from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassification
+import torch
+from transformers import AutoTokenizer, AutoModelForSequenceClassification
+import onnxruntime as ort
+from filelock import FileLock
+from onnxruntime.quantization import QuantType, quantize_dynamic
+from optimum.onnxruntime import ORTModelForSequenceClassification
 import yfinance as yf
-import requests
-from bs4 import BeautifulSoup
 import re
 
 from models.sentiment_models import SentimentAnalysisResponse, SentimentScore, SourceSentiment, SentimentSource, TimeRange
+from utils.cache import TTLCache
+from utils.concurrency import web_concurrency
+from utils.yahoo_fast import create_session, fetch_news
 
 logger = logging.getLogger(__name__)
 
+SENTIMENT_MODEL_ID = "cardiffnlp/twitter-roberta-base-sentiment-latest"
+FALLBACK_MODEL_ID = "distilbert-base-uncased-finetuned-sst-2-english"
+ONNX_MODEL_DIR = "models/saved/sentiment_onnx"
+ONNX_INT8_FILE = "model_int8.onnx"
+SENTIMENT_BATCH_SIZE = 16
+# Texts queued by concurrent requests are flushed together once this many are pending or the wait elapses
+INFERENCE_MAX_TEXTS = 32
+INFERENCE_MAX_WAIT = 0.005
+MAX_CONCURRENT_SYMBOLS = 8
+MARKET_DATA_TTL = 120
+SCORE_TTL = 60
+MAX_YFINANCE_THREADS = 16
+# Padded lengths the TorchScript fallback is traced for
+TRACE_LENGTHS = (64, 128, 256, 512)
+
+# Score thresholds and the labels of the buckets they delimit
+_T = np.array([-0.6, -0.2, 0.2, 0.6])
+_L = ('very_negative', 'negative', 'neutral', 'positive', 'very_positive')
+
+# Per-article model output: signed score, confidence and label sign
+SENT_DTYPE = np.dtype([('score', 'f4'), ('conf', 'f4'), ('sign', 'i1')])
+
+# Source weights when combining sentiments: news, social
+_WEIGHTS = np.array([0.6, 0.4])
+
+# Simulated social noise is drawn in blocks rather than one scalar per call
+_RNG = np.random.default_rng()
+RANDOM_BUFFER_SIZE = 4096
+
+# Article text cleanup, compiled once
+_URL_RE = re.compile(r'https?://\S+')
+_CLEAN_RE = re.compile(r'\s+')
+
 class SentimentService:
     def __init__(self):
-        self.sentiment_analyzer = None
+        self._tokenizer = None
+        self._onnx_model = None
+        self._labels: List[str] = []
+        self._label_signs = np.zeros(0, dtype=np.int8)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._inference_queue: Optional[asyncio.Queue] = None
+        self._inference_task: Optional[asyncio.Task] = None
+        self._history_cache = TTLCache(MARKET_DATA_TTL, maxsize=1024)
+        self._news_cache = TTLCache(MARKET_DATA_TTL, maxsize=1024)
+        self._score_cache = TTLCache(SCORE_TTL, maxsize=4096)
+        self._yfinance_slots = asyncio.BoundedSemaphore(MAX_YFINANCE_THREADS)
+        self._noise_buffer = np.empty(0)
+        self._volume_buffer = np.empty(0, dtype=np.int64)
+        self._random_index = 0
         self.news_sources = {
             'yahoo': 'https://finance.yahoo.com/news/',
             'reuters': 'https://www.reuters.com/markets/',
@@ -27,43 +83,158 @@ class SentimentService:
         
     async def initialize(self):
         """Initialize sentiment analysis models"""
+        # Keep-alive connections shared by all news requests
+        self._session = create_session(limit=100, limit_per_host=20, keepalive_timeout=60)
+        self._inference_queue = asyncio.Queue()
+        self._inference_task = asyncio.create_task(self._batch_worker())
         try:
             logger.info("Loading sentiment analysis model...")
-            # Load pre-trained sentiment analysis model
-            self.sentiment_analyzer = pipeline(
-                "sentiment-analysis",
-                model="cardiffnlp/twitter-roberta-base-sentiment-latest",
-                tokenizer="cardiffnlp/twitter-roberta-base-sentiment-latest"
-            )
+            # Load pre-trained sentiment analysis model as an optimized ONNX Runtime graph
+            self._tokenizer = await asyncio.to_thread(_get_tokenizer)
+            self._onnx_model = await asyncio.to_thread(_load_onnx_model)
+            self._set_labels(self._onnx_model.config)
             logger.info("Sentiment analysis model loaded successfully")
         except Exception as e:
             logger.warning(f"Failed to load advanced model, using fallback: {str(e)}")
-            # Fallback to simpler model
-            self.sentiment_analyzer = pipeline("sentiment-analysis")
+            # Fallback to simpler model, traced to TorchScript per padded length on first use
+            self._onnx_model = None
+            self._tokenizer, model = await asyncio.to_thread(_get_fallback_model)
+            self._set_labels(model.config)
+    
+    def _set_labels(self, config):
+        """Record the model's class labels and the sentiment sign of each"""
+        self._labels = [config.id2label[i] for i in range(config.num_labels)]
+        self._label_signs = np.array(
+            [1 if 'positive' in label.lower() else -1 if 'negative' in label.lower() else 0 for label in self._labels],
+            dtype=np.int8
+        )
+    
+    async def close(self):
+        """Stop the inference worker, failing any queued texts, and close the shared HTTP session"""
+        if self._inference_task:
+            self._inference_task.cancel()
+            try:
+                await self._inference_task
+            except asyncio.CancelledError:
+                pass
+            self._inference_task = None
+        
+        while self._inference_queue and not self._inference_queue.empty():
+            _, future = self._inference_queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Sentiment inference worker stopped"))
+        
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+    
+    async def _classify(self, texts: List[str]) -> np.ndarray:
+        """Queue texts for the shared inference worker and wait for their results"""
+        future = asyncio.get_running_loop().create_future()
+        await self._inference_queue.put((texts, future))
+        return await future
+    
+    async def _batch_worker(self):
+        """Collect texts queued by concurrent requests and score them in shared batches"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._inference_queue.get()]
+            pending = len(batch[0][0])
+            deadline = loop.time() + INFERENCE_MAX_WAIT
+            
+            while pending < INFERENCE_MAX_TEXTS:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._inference_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+                pending += len(batch[-1][0])
+            
+            texts = [text for item_texts, _ in batch for text in item_texts]
+            try:
+                results = await asyncio.to_thread(self._score_texts, texts)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            start = 0
+            for item_texts, future in batch:
+                if not future.done():
+                    future.set_result(results[start:start + len(item_texts)])
+                start += len(item_texts)
+    
+    def _score_texts(self, texts: List[str]) -> np.ndarray:
+        """Classify texts in batches, returning one SENT_DTYPE record per text"""
+        # A lone text (e.g. a just-posted headline) skips length sorting and batch assembly
+        logits = self._single_logits(texts[0]) if len(texts) == 1 else self._batched_logits(texts)
+        
+        # Softmax over classes, keeping the top label per text
+        probs = np.exp(logits - logits.max(axis=1, keepdims=True))
+        probs /= probs.sum(axis=1, keepdims=True)
+        best = probs.argmax(axis=1)
+        
+        results = np.empty(len(texts), dtype=SENT_DTYPE)
+        results['conf'] = probs[np.arange(len(best)), best]
+        results['sign'] = self._label_signs[best]
+        results['score'] = results['sign'] * results['conf']
+        return results
+    
+    def _single_logits(self, text: str) -> np.ndarray:
+        """Logits for one text, tokenized straight to model inputs"""
+        if self._onnx_model is not None:
+            session = self._onnx_model.model
+            encoded = self._tokenizer(text, truncation=True, max_length=512, return_tensors="np")
+            return session.run(None, {node.name: encoded[node.name] for node in session.get_inputs()})[0]
+        
+        encoded = self._tokenizer(text, truncation=True, max_length=512)
+        return self._traced_logits({name: [values] for name, values in encoded.items()}, len(encoded['input_ids']))
+    
+    def _batched_logits(self, texts: List[str]) -> np.ndarray:
+        """Logits for many texts, run in batches of similar token length"""
+        encoded = self._tokenizer(texts, truncation=True, max_length=512)
+        lengths = np.fromiter(map(len, encoded['input_ids']), dtype=np.int64, count=len(texts))
+        
+        # Batch texts in order of token length so each batch pads only to its own longest text
+        order = np.argsort(lengths, kind='stable')
+        logits = np.empty((len(texts), len(self._labels)), dtype=np.float32)
+        for start in range(0, len(texts), SENTIMENT_BATCH_SIZE):
+            rows = order[start:start + SENTIMENT_BATCH_SIZE]
+            batch = {name: [values[i] for i in rows] for name, values in encoded.items()}
+            if self._onnx_model is not None:
+                session = self._onnx_model.model
+                padded = self._tokenizer.pad(batch, padding=True, return_tensors="np")
+                logits[rows] = session.run(None, {node.name: padded[node.name] for node in session.get_inputs()})[0]
+            else:
+                logits[rows] = self._traced_logits(batch, int(lengths[rows[-1]]))
+        return logits
+    
+    def _traced_logits(self, batch: Dict[str, List[List[int]]], longest: int) -> np.ndarray:
+        """Run a tokenized batch through the TorchScript fallback traced for the smallest fitting padded length"""
+        length = next(size for size in TRACE_LENGTHS if size >= longest)
+        padded = self._tokenizer.pad(batch, padding="max_length", max_length=length, return_tensors="pt")
+        
+        with torch.inference_mode():
+            logits = _traced_fallback(length)(padded['input_ids'], padded['attention_mask'])[0]
+        return logits.numpy()
     
     async def analyze_sentiment(self, symbols: List[str], sources: List[SentimentSource], 
                               time_range: TimeRange) -> SentimentAnalysisResponse:
         """Analyze sentiment for given symbols from specified sources"""
         try:
-            sentiment_scores = []
             source_breakdown = []
             
-            for symbol in symbols:
-                # Analyze sentiment from different sources
-                news_sentiment = await self._analyze_news_sentiment(symbol, time_range)
-                social_sentiment = await self._analyze_social_sentiment(symbol, time_range)
-                
-                # Combine sentiments
-                overall_sentiment = self._combine_sentiments([news_sentiment, social_sentiment])
-                
-                sentiment_scores.append(SentimentScore(
-                    symbol=symbol,
-                    overall_sentiment=overall_sentiment['score'],
-                    sentiment_label=overall_sentiment['label'],
-                    confidence=overall_sentiment['confidence'],
-                    volume=overall_sentiment['volume'],
-                    trending=overall_sentiment['trending']
-                ))
+            # Analyze all symbols concurrently, bounded by a semaphore
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_SYMBOLS)
+            
+            async def bounded(symbol: str) -> SentimentScore:
+                async with semaphore:
+                    return await self._process_symbol(symbol, time_range)
+            
+            sentiment_scores = list(await asyncio.gather(*[bounded(symbol) for symbol in symbols]))
             
             # Analyze source breakdown
             if SentimentSource.NEWS in sources:
@@ -94,6 +265,31 @@ class SentimentService:
             logger.error(f"Sentiment analysis failed: {str(e)}")
             raise
     
+    async def _process_symbol(self, symbol: str, time_range: TimeRange) -> SentimentScore:
+        """Sentiment score for one symbol, memoized per (symbol, time range) for a short TTL"""
+        return await self._score_cache.get_or_set(
+            (symbol, time_range), lambda: self._score_symbol(symbol, time_range)
+        )
+    
+    async def _score_symbol(self, symbol: str, time_range: TimeRange) -> SentimentScore:
+        """Analyze and combine news and social sentiment for one symbol"""
+        news_sentiment, social_sentiment = await asyncio.gather(
+            self._analyze_news_sentiment(symbol, time_range),
+            self._analyze_social_sentiment(symbol, time_range)
+        )
+        
+        # Combine sentiments
+        overall_sentiment = self._combine_sentiments([news_sentiment, social_sentiment])
+        
+        return SentimentScore(
+            symbol=symbol,
+            overall_sentiment=overall_sentiment['score'],
+            sentiment_label=overall_sentiment['label'],
+            confidence=overall_sentiment['confidence'],
+            volume=overall_sentiment['volume'],
+            trending=overall_sentiment['trending']
+        )
+    
     async def _analyze_news_sentiment(self, symbol: str, time_range: TimeRange) -> Dict[str, Any]:
         """Analyze sentiment from news sources"""
         try:
@@ -109,20 +305,19 @@ class SentimentService:
                     'trending': False
                 }
             
-            # Analyze sentiment of each article
-            sentiments = []
-            for article in articles:
+            # Combine title and description for analysis, then score all articles in one batched call
+            texts = [self._clean_text(f"{article.get('title', '')} {article.get('description', '')}")[:512]
+                     for article in articles]
+            texts = [text for text in texts if text]
+            
+            sentiments = np.empty(0, dtype=SENT_DTYPE)
+            if texts:
                 try:
-                    # Combine title and description for analysis
-                    text = f"{article.get('title', '')} {article.get('description', '')}"
-                    if len(text.strip()) > 0:
-                        sentiment = self.sentiment_analyzer(text[:512])  # Limit text length
-                        sentiments.append(sentiment[0])
+                    sentiments = await self._classify(texts)
                 except Exception as e:
                     logger.warning(f"Failed to analyze article sentiment: {str(e)}")
-                    continue
             
-            if not sentiments:
+            if len(sentiments) == 0:
                 return {
                     'score': 0.0,
                     'label': 'neutral',
@@ -155,8 +350,7 @@ class SentimentService:
             # In production, this would integrate with Twitter API, Reddit API, etc.
             
             # Generate mock social sentiment based on recent price movement
-            ticker = yf.Ticker(symbol)
-            hist = ticker.history(period="5d")
+            hist = await self._cached_history(symbol)
             
             if len(hist) > 1:
                 price_change = (hist['Close'].iloc[-1] - hist['Close'].iloc[0]) / hist['Close'].iloc[0]
@@ -173,14 +367,15 @@ class SentimentService:
                     label = 'neutral'
                 
                 # Add some randomness to simulate real social sentiment
-                sentiment_score += np.random.normal(0, 0.1)
+                noise, volume = self._draw_social_noise()
+                sentiment_score += noise
                 sentiment_score = max(-1.0, min(1.0, sentiment_score))
                 
                 return {
                     'score': sentiment_score,
                     'label': label,
                     'confidence': 0.7,
-                    'volume': np.random.randint(50, 500),
+                    'volume': volume,
                     'trending': abs(price_change) > 0.1
                 }
             
@@ -202,12 +397,22 @@ class SentimentService:
                 'trending': False
             }
     
+    def _draw_social_noise(self) -> Tuple[float, int]:
+        """Next (score noise, mention volume) pair from the pre-generated buffers, refilling when exhausted"""
+        if self._random_index >= len(self._noise_buffer):
+            self._noise_buffer = _RNG.normal(0, 0.1, size=RANDOM_BUFFER_SIZE)
+            self._volume_buffer = _RNG.integers(50, 500, size=RANDOM_BUFFER_SIZE)
+            self._random_index = 0
+        
+        index = self._random_index
+        self._random_index += 1
+        return float(self._noise_buffer[index]), int(self._volume_buffer[index])
+    
     async def _fetch_news_articles(self, symbol: str, time_range: TimeRange) -> List[Dict[str, Any]]:
         """Fetch news articles for a symbol"""
         try:
             # Use Yahoo Finance news as primary source
-            ticker = yf.Ticker(symbol)
-            news = ticker.news
+            news = await self._cached_news(symbol)
             
             articles = []
             for article in news[:20]:  # Limit to recent articles
@@ -225,48 +430,41 @@ class SentimentService:
             logger.error(f"Failed to fetch news for {symbol}: {str(e)}")
             return []
     
-    def _calculate_overall_sentiment(self, sentiments: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Calculate overall sentiment from individual sentiment scores"""
-        if not sentiments:
+    def _clean_text(self, text: str) -> str:
+        """Strip URLs and collapse runs of whitespace in article text"""
+        return _CLEAN_RE.sub(' ', _URL_RE.sub('', text)).strip()
+    
+    async def _cached_history(self, symbol: str) -> pd.DataFrame:
+        """Last five days of price history, memoized per symbol for a short TTL"""
+        return await self._history_cache.get_or_set(symbol, lambda: self._download_history(symbol))
+    
+    async def _download_history(self, symbol: str) -> pd.DataFrame:
+        """Run the blocking yfinance history call on a worker thread, capping concurrent calls"""
+        async with self._yfinance_slots:
+            return await asyncio.to_thread(lambda: yf.Ticker(symbol).history(period="5d"))
+    
+    async def _cached_news(self, symbol: str) -> List[Dict[str, Any]]:
+        """Recent news items, memoized per symbol for a short TTL"""
+        return await self._news_cache.get_or_set(
+            symbol, lambda: fetch_news(self._session, symbol, count=20)
+        )
+    
+    def _calculate_overall_sentiment(self, sentiments: np.ndarray) -> Dict[str, Any]:
+        """Calculate overall sentiment from a SENT_DTYPE array of individual sentiment scores"""
+        if len(sentiments) == 0:
             return {
                 'score': 0.0,
                 'label': 'neutral',
                 'confidence': 0.0
             }
         
-        # Convert sentiment labels to scores
-        scores = []
-        confidences = []
-        
-        for sentiment in sentiments:
-            label = sentiment['label'].lower()
-            confidence = sentiment['score']
-            
-            if 'positive' in label:
-                score = confidence
-            elif 'negative' in label:
-                score = -confidence
-            else:
-                score = 0.0
-            
-            scores.append(score)
-            confidences.append(confidence)
-        
         # Calculate weighted average
-        overall_score = np.average(scores, weights=confidences)
-        overall_confidence = np.mean(confidences)
+        confidences = sentiments['conf']
+        overall_score = np.average(sentiments['score'], weights=confidences)
+        overall_confidence = confidences.mean()
         
         # Determine label
-        if overall_score > 0.6:
-            label = 'very_positive'
-        elif overall_score > 0.2:
-            label = 'positive'
-        elif overall_score > -0.2:
-            label = 'neutral'
-        elif overall_score > -0.6:
-            label = 'negative'
-        else:
-            label = 'very_negative'
+        label = _L[int(np.searchsorted(_T, overall_score))]
         
         return {
             'score': float(overall_score),
@@ -286,29 +484,20 @@ class SentimentService:
             }
         
         # Weight different sources
-        weights = [0.6, 0.4]  # News, Social
+        count = len(sentiments)
+        weights = _WEIGHTS[:count] / _WEIGHTS[:count].sum()
         
-        scores = [s['score'] for s in sentiments]
-        confidences = [s['confidence'] for s in sentiments]
-        volumes = [s['volume'] for s in sentiments]
+        scores = np.fromiter((s['score'] for s in sentiments), dtype=np.float64, count=count)
+        confidences = np.fromiter((s['confidence'] for s in sentiments), dtype=np.float64, count=count)
         
         # Calculate weighted averages
-        overall_score = np.average(scores, weights=weights[:len(scores)])
-        overall_confidence = np.average(confidences, weights=weights[:len(confidences)])
-        total_volume = sum(volumes)
+        overall_score = scores @ weights
+        overall_confidence = confidences @ weights
+        total_volume = sum(s['volume'] for s in sentiments)
         trending = any(s['trending'] for s in sentiments)
         
         # Determine label
-        if overall_score > 0.6:
-            label = 'very_positive'
-        elif overall_score > 0.2:
-            label = 'positive'
-        elif overall_score > -0.2:
-            label = 'neutral'
-        elif overall_score > -0.6:
-            label = 'negative'
-        else:
-            label = 'very_negative'
+        label = _L[int(np.searchsorted(_T, overall_score))]
         
         return {
             'score': float(overall_score),
@@ -353,7 +542,10 @@ class SentimentService:
         if not sentiment_scores:
             return "neutral"
         
-        avg_sentiment = np.mean([score.overall_sentiment for score in sentiment_scores])
+        avg_sentiment = float(np.fromiter(
+            (score.overall_sentiment for score in sentiment_scores),
+            dtype=np.float64, count=len(sentiment_scores)
+        ).mean())
         
         if avg_sentiment > 0.4:
             return "bullish"
@@ -410,3 +602,64 @@ class SentimentService:
         except Exception as e:
             logger.error(f"Failed to generate market insights: {str(e)}")
             return []
+
+# Model loaders are cached so every SentimentService in the process shares one copy of the weights
+@lru_cache(maxsize=1)
+def _get_tokenizer():
+    """Shared tokenizer for the sentiment model"""
+    return AutoTokenizer.from_pretrained(SENTIMENT_MODEL_ID)
+
+@lru_cache(maxsize=1)
+def _load_onnx_model() -> ORTModelForSequenceClassification:
+    """Load the shared INT8 ONNX model from disk, exporting and quantizing it on first use"""
+    session_options = ort.SessionOptions()
+    session_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    # Every server worker loads its own session, so they split the cores between them
+    session_options.intra_op_num_threads = max(1, (os.cpu_count() or 1) // web_concurrency())
+    
+    int8_path = os.path.join(ONNX_MODEL_DIR, ONNX_INT8_FILE)
+    if not os.path.exists(int8_path):
+        # Server workers booting together take turns; all but the first find the finished model
+        os.makedirs(ONNX_MODEL_DIR, exist_ok=True)
+        with FileLock(os.path.join(ONNX_MODEL_DIR, ".export.lock")):
+            if not os.path.exists(int8_path):
+                _export_onnx_model()
+    
+    return ORTModelForSequenceClassification.from_pretrained(
+        ONNX_MODEL_DIR, file_name=ONNX_INT8_FILE,
+        session_options=session_options, provider="CPUExecutionProvider"
+    )
+
+def _export_onnx_model():
+    """Export and quantize the sentiment model in a scratch directory, then move the files into
+    ONNX_MODEL_DIR with the INT8 model last, so it only appears once everything else is in place"""
+    scratch_dir = tempfile.mkdtemp(dir=ONNX_MODEL_DIR)
+    try:
+        model = ORTModelForSequenceClassification.from_pretrained(SENTIMENT_MODEL_ID, export=True)
+        model.save_pretrained(scratch_dir)
+        
+        # Dynamic INT8 quantization of the MatMul/Gemm weights
+        quantize_dynamic(os.path.join(scratch_dir, "model.onnx"), os.path.join(scratch_dir, ONNX_INT8_FILE),
+                         op_types_to_quantize=['MatMul', 'Gemm'], weight_type=QuantType.QInt8)
+        
+        file_names = sorted(os.listdir(scratch_dir), key=lambda name: name == ONNX_INT8_FILE)
+        for file_name in file_names:
+            os.replace(os.path.join(scratch_dir, file_name), os.path.join(ONNX_MODEL_DIR, file_name))
+    finally:
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+
+@lru_cache(maxsize=1)
+def _get_fallback_model():
+    """Shared tokenizer and eval-mode PyTorch model used when the ONNX model can't be loaded"""
+    tokenizer = AutoTokenizer.from_pretrained(FALLBACK_MODEL_ID)
+    model = AutoModelForSequenceClassification.from_pretrained(FALLBACK_MODEL_ID, torchscript=True).eval()
+    return tokenizer, model
+
+@lru_cache(maxsize=len(TRACE_LENGTHS))
+def _traced_fallback(length: int) -> torch.jit.ScriptModule:
+    """Fallback model traced for inputs padded to length. The trace is not frozen, so it shares the
+    fallback model's parameters and each length only adds a graph, not another copy of the weights."""
+    tokenizer, model = _get_fallback_model()
+    example = tokenizer("warmup text", return_tensors="pt", padding="max_length", max_length=length)
+    with torch.no_grad():
+        return torch.jit.trace(model, (example['input_ids'], example['attention_mask']))
@@ -1,16 +1,23 @@
+import asyncio
 import numpy as np
 import pandas as pd
 import yfinance as yf
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 import logging
-import ta
-from scipy import stats
+from functools import lru_cache
 
 from models.prediction_models import TechnicalAnalysisResponse, TechnicalIndicator
+from utils.cache import TTLCache
+from utils._njit import njit
 
 logger = logging.getLogger(__name__)
 
+# Periods short enough that the latest bars move within minutes
+SHORT_PERIODS = {'1d', '5d'}
+# Concurrent blocking yfinance downloads, so a burst of misses can't fill the default thread pool
+MAX_YFINANCE_THREADS = 16
+
 class TechnicalAnalyzer:
     def __init__(self):
         self.indicators_config = {
@@ -24,6 +31,8 @@ class TechnicalAnalyzer:
             'CCI': {'period': 20},
             'WILLIAMS': {'period': 14}
         }
+        self._data_cache = TTLCache(ttl=900, maxsize=256)
+        self._yfinance_slots = asyncio.BoundedSemaphore(MAX_YFINANCE_THREADS)
     
     async def analyze(self, symbol: str, period: str, indicators: List[str]) -> TechnicalAnalysisResponse:
         """Perform comprehensive technical analysis"""
@@ -31,13 +40,8 @@ class TechnicalAnalyzer:
             # Fetch historical data
             data = await self._fetch_data(symbol, period)
             
-            # Calculate requested indicators
-            calculated_indicators = []
-            for indicator_name in indicators:
-                if indicator_name in self.indicators_config:
-                    indicator_result = await self._calculate_indicator(data, indicator_name)
-                    if indicator_result:
-                        calculated_indicators.append(indicator_result)
+            # Calculate requested indicators from one shared set of price arrays in a single worker thread call
+            calculated_indicators = await asyncio.to_thread(self._calculate_indicators, data, indicators)
             
             # Determine overall signal
             overall_signal, strength = self._determine_overall_signal(calculated_indicators)
@@ -65,10 +69,16 @@ class TechnicalAnalyzer:
             raise
     
     async def _fetch_data(self, symbol: str, period: str) -> pd.DataFrame:
-        """Fetch historical data for technical analysis"""
+        """Fetch historical data for technical analysis (cached per symbol and period; concurrent misses share one download)"""
+        return await self._data_cache.get_or_set(
+            (symbol, period), lambda: self._download_data(symbol, period), ttl=60 if period in SHORT_PERIODS else None
+        )
+    
+    async def _download_data(self, symbol: str, period: str) -> pd.DataFrame:
+        """Download historical data on a worker thread, capping concurrent calls"""
         try:
-            ticker = yf.Ticker(symbol)
-            data = ticker.history(period=period)
+            async with self._yfinance_slots:
+                data = await asyncio.to_thread(lambda: yf.Ticker(symbol).history(period=period))
             
             if data.empty:
                 raise ValueError(f"No data found for symbol {symbol}")
@@ -79,27 +89,85 @@ class TechnicalAnalyzer:
             logger.error(f"Failed to fetch data for {symbol}: {str(e)}")
             raise
     
-    async def _calculate_indicator(self, data: pd.DataFrame, indicator_name: str) -> Optional[TechnicalIndicator]:
+    def _calculate_indicators(self, data: pd.DataFrame, indicator_names: List[str]) -> List[TechnicalIndicator]:
+        """Calculate the requested indicators one after another (they are microsecond reductions over shared arrays)"""
+        requested = [name for name in indicator_names if name in self.indicators_config]
+        ctx = self._indicator_context(data, requested)
+        results = [self._calculate_indicator_sync(ctx, indicator_name) for indicator_name in requested]
+        return [result for result in results if result]
+    
+    def _indicator_context(self, data: pd.DataFrame, indicator_names: List[str]) -> Dict[Any, Any]:
+        """Contiguous float64 price arrays plus the intermediates shared between the requested indicators,
+        all computed up front so the indicator methods only read from it"""
+        close = data['Close'].to_numpy(dtype=np.float64)
+        high = data['High'].to_numpy(dtype=np.float64)
+        low = data['Low'].to_numpy(dtype=np.float64)
+        ctx = {'close': close, 'high': high, 'low': low}
+        names = set(indicator_names)
+        
+        # EMAs for MACD and the EMA crossover, two spans per pass over the closes
+        spans = set()
+        if 'MACD' in names:
+            spans.update((self.indicators_config['MACD']['fast'], self.indicators_config['MACD']['slow']))
+        if 'EMA' in names:
+            spans.update(self.indicators_config['EMA']['periods'])
+        spans = sorted(spans)
+        for fast, slow in zip(spans[::2], spans[1::2]):
+            ctx[('ema', fast)], ctx[('ema', slow)] = _dual_ema_njit(close, fast, slow)
+        if len(spans) % 2:
+            ctx[('ema', spans[-1])] = _ema_njit(close, spans[-1])
+        
+        # Latest SMA values for Bollinger Bands and the SMA crossover
+        sma_periods = set()
+        if 'BB' in names:
+            sma_periods.add(self.indicators_config['BB']['period'])
+        if 'SMA' in names:
+            sma_periods.update(self.indicators_config['SMA']['periods'][:2])
+        for period in sma_periods:
+            ctx[('sma', period)] = _tail_mean(close, period)
+        
+        # Highest highs/lowest lows of the trailing windows, enough of them for every consumer of a period
+        window_counts = {}
+        if 'STOCH' in names:
+            config = self.indicators_config['STOCH']
+            window_counts[config['k_period']] = config['d_period']
+        if 'WILLIAMS' in names:
+            period = self.indicators_config['WILLIAMS']['period']
+            window_counts[period] = max(window_counts.get(period, 0), 1)
+        for period, count in window_counts.items():
+            ctx[('extremes', period)] = (
+                _windows(high, period, count).max(axis=1),
+                _windows(low, period, count).min(axis=1)
+            )
+        
+        if 'ADX' in names:
+            ctx['true_range'] = _true_range(high, low, close)
+        if 'CCI' in names:
+            ctx['typical_price'] = (high + low + close) / 3.0
+        
+        return ctx
+        
+    def _calculate_indicator_sync(self, ctx: Dict[Any, Any], indicator_name: str) -> Optional[TechnicalIndicator]:
         """Calculate a specific technical indicator"""
         try:
             if indicator_name == 'RSI':
-                return self._calculate_rsi(data)
+                return self._calculate_rsi(ctx)
             elif indicator_name == 'MACD':
-                return self._calculate_macd(data)
+                return self._calculate_macd(ctx)
             elif indicator_name == 'BB':
-                return self._calculate_bollinger_bands(data)
+                return self._calculate_bollinger_bands(ctx)
             elif indicator_name == 'SMA':
-                return self._calculate_sma(data)
+                return self._calculate_sma(ctx)
             elif indicator_name == 'EMA':
-                return self._calculate_ema(data)
+                return self._calculate_ema(ctx)
             elif indicator_name == 'STOCH':
-                return self._calculate_stochastic(data)
+                return self._calculate_stochastic(ctx)
             elif indicator_name == 'ADX':
-                return self._calculate_adx(data)
+                return self._calculate_adx(ctx)
             elif indicator_name == 'CCI':
-                return self._calculate_cci(data)
+                return self._calculate_cci(ctx)
             elif indicator_name == 'WILLIAMS':
-                return self._calculate_williams_r(data)
+                return self._calculate_williams_r(ctx)
             else:
                 logger.warning(f"Unknown indicator: {indicator_name}")
                 return None
@@ -108,11 +176,10 @@ class TechnicalAnalyzer:
             logger.error(f"Failed to calculate {indicator_name}: {str(e)}")
             return None
     
-    def _calculate_rsi(self, data: pd.DataFrame) -> TechnicalIndicator:
+    def _calculate_rsi(self, ctx: Dict[Any, Any]) -> TechnicalIndicator:
         """Calculate RSI indicator"""
         config = self.indicators_config['RSI']
-        rsi = ta.momentum.rsi(data['Close'], window=config['period'])
-        current_rsi = rsi.iloc[-1]
+        current_rsi = _rsi_njit(ctx['close'], config['period'])[-1]
         
         # Determine signal
         if current_rsi > config['overbought']:
@@ -125,24 +192,23 @@ class TechnicalAnalyzer:
             signal = 'neutral'
             description = f"RSI is neutral at {current_rsi:.1f}"
         
-        return TechnicalIndicator(
+        return _make_indicator(
             name='RSI',
-            value=float(current_rsi),
+            value=round(float(current_rsi), 4),
             signal=signal,
             description=description
         )
     
-    def _calculate_macd(self, data: pd.DataFrame) -> TechnicalIndicator:
+    def _calculate_macd(self, ctx: Dict[Any, Any]) -> TechnicalIndicator:
         """Calculate MACD indicator"""
         config = self.indicators_config['MACD']
         
-        macd_line = ta.trend.macd(data['Close'], window_fast=config['fast'], window_slow=config['slow'])
-        macd_signal = ta.trend.macd_signal(data['Close'], window_fast=config['fast'], 
-                                         window_slow=config['slow'], window_sign=config['signal'])
-        macd_histogram = macd_line - macd_signal
-        
-        current_histogram = macd_histogram.iloc[-1]
-        prev_histogram = macd_histogram.iloc[-2]
+        ema_fast, ema_slow = ctx[('ema', config['fast'])], ctx[('ema', config['slow'])]
+        # The signal EMA starts at the first complete MACD value
+        macd_line = (ema_fast - ema_slow)[config['slow'] - 1:]
+        signal_line = _ema_njit(macd_line, config['signal'])
+        # Only the last two histogram values feed the crossover check
+        prev_histogram, current_histogram = macd_line[-2:] - signal_line[-2:]
         
         # Determine signal based on histogram crossover
         if current_histogram > 0 and prev_histogram <= 0:
@@ -158,26 +224,24 @@ class TechnicalAnalyzer:
             signal = 'sell' if current_histogram < 0 else 'neutral'
             description = "MACD histogram is decreasing"
         
-        return TechnicalIndicator(
+        return _make_indicator(
             name='MACD',
-            value=float(current_histogram),
+            value=round(float(current_histogram), 4),
             signal=signal,
             description=description
         )
     
-    def _calculate_bollinger_bands(self, data: pd.DataFrame) -> TechnicalIndicator:
+    def _calculate_bollinger_bands(self, ctx: Dict[Any, Any]) -> TechnicalIndicator:
         """Calculate Bollinger Bands indicator"""
         config = self.indicators_config['BB']
+        close = ctx['close']
         
-        bb = ta.volatility.BollingerBands(data['Close'], window=config['period'], window_dev=config['std'])
-        upper_band = bb.bollinger_hband()
-        lower_band = bb.bollinger_lband()
-        middle_band = bb.bollinger_mavg()
+        current_middle = ctx[('sma', config['period'])]
+        band_width = config['std'] * _tail(close, config['period']).std()
         
-        current_price = data['Close'].iloc[-1]
-        current_upper = upper_band.iloc[-1]
-        current_lower = lower_band.iloc[-1]
-        current_middle = middle_band.iloc[-1]
+        current_price = close[-1]
+        current_upper = current_middle + band_width
+        current_lower = current_middle - band_width
         
         # Calculate position within bands
         band_position = (current_price - current_lower) / (current_upper - current_lower)
@@ -193,21 +257,21 @@ class TechnicalAnalyzer:
             signal = 'neutral'
             description = f"Price within Bollinger Bands (position: {band_position:.2f})"
         
-        return TechnicalIndicator(
+        return _make_indicator(
             name='Bollinger Bands',
-            value=float(band_position),
+            value=round(float(band_position), 4),
             signal=signal,
             description=description
         )
     
-    def _calculate_sma(self, data: pd.DataFrame) -> TechnicalIndicator:
+    def _calculate_sma(self, ctx: Dict[Any, Any]) -> TechnicalIndicator:
         """Calculate Simple Moving Average indicator"""
         config = self.indicators_config['SMA']
-        current_price = data['Close'].iloc[-1]
+        close = ctx['close']
+        current_price = close[-1]
         
         # Calculate multiple SMAs
-        sma_20 = ta.trend.sma_indicator(data['Close'], window=20).iloc[-1]
-        sma_50 = ta.trend.sma_indicator(data['Close'], window=50).iloc[-1]
+        sma_20, sma_50 = (ctx[('sma', period)] for period in config['periods'][:2])
         
         # Determine signal based on price vs SMA and SMA crossovers
         if current_price > sma_20 > sma_50:
@@ -220,20 +284,20 @@ class TechnicalAnalyzer:
             signal = 'neutral'
             description = f"Mixed SMA signals - Price: {current_price:.2f}, SMA20: {sma_20:.2f}, SMA50: {sma_50:.2f}"
         
-        return TechnicalIndicator(
+        return _make_indicator(
             name='SMA',
-            value=float(current_price / sma_20),  # Price to SMA20 ratio
+            value=round(float(current_price / sma_20), 4),  # Price to SMA20 ratio
             signal=signal,
             description=description
         )
     
-    def _calculate_ema(self, data: pd.DataFrame) -> TechnicalIndicator:
+    def _calculate_ema(self, ctx: Dict[Any, Any]) -> TechnicalIndicator:
         """Calculate Exponential Moving Average indicator"""
         config = self.indicators_config['EMA']
-        current_price = data['Close'].iloc[-1]
+        close = ctx['close']
+        current_price = close[-1]
         
-        ema_12 = ta.trend.ema_indicator(data['Close'], window=12).iloc[-1]
-        ema_26 = ta.trend.ema_indicator(data['Close'], window=26).iloc[-1]
+        ema_12, ema_26 = (ctx[('ema', period)][-1] for period in config['periods'])
         
         # Determine signal based on EMA crossover
         if ema_12 > ema_26 and current_price > ema_12:
@@ -246,24 +310,24 @@ class TechnicalAnalyzer:
             signal = 'neutral'
             description = f"Mixed EMA signals - EMA12: {ema_12:.2f}, EMA26: {ema_26:.2f}"
         
-        return TechnicalIndicator(
+        return _make_indicator(
             name='EMA',
-            value=float(ema_12 / ema_26),  # EMA12 to EMA26 ratio
+            value=round(float(ema_12 / ema_26), 4),  # EMA12 to EMA26 ratio
             signal=signal,
             description=description
         )
     
-    def _calculate_stochastic(self, data: pd.DataFrame) -> TechnicalIndicator:
+    def _calculate_stochastic(self, ctx: Dict[Any, Any]) -> TechnicalIndicator:
         """Calculate Stochastic Oscillator"""
         config = self.indicators_config['STOCH']
+        window, smooth = config['k_period'], config['d_period']
         
-        stoch_k = ta.momentum.stoch(data['High'], data['Low'], data['Close'], 
-                                  window=config['k_period'], smooth_window=config['d_period'])
-        stoch_d = ta.momentum.stoch_signal(data['High'], data['Low'], data['Close'],
-                                         window=config['k_period'], smooth_window=config['d_period'])
+        # %K over the last d_period bars, %D their mean
+        highest, lowest = (extremes[-smooth:] for extremes in ctx[('extremes', window)])
+        stoch_k = 100 * (_tail(ctx['close'], smooth) - lowest) / (highest - lowest)
         
-        current_k = stoch_k.iloc[-1]
-        current_d = stoch_d.iloc[-1]
+        current_k = stoch_k[-1]
+        current_d = stoch_k.mean()
         
         # Determine signal
         if current_k < 20 and current_d < 20:
@@ -276,19 +340,18 @@ class TechnicalAnalyzer:
             signal = 'neutral'
             description = f"Stochastic neutral (%K: {current_k:.1f}, %D: {current_d:.1f})"
         
-        return TechnicalIndicator(
+        return _make_indicator(
             name='Stochastic',
-            value=float(current_k),
+            value=round(float(current_k), 4),
             signal=signal,
             description=description
         )
     
-    def _calculate_adx(self, data: pd.DataFrame) -> TechnicalIndicator:
+    def _calculate_adx(self, ctx: Dict[Any, Any]) -> TechnicalIndicator:
         """Calculate Average Directional Index"""
         config = self.indicators_config['ADX']
         
-        adx = ta.trend.adx(data['High'], data['Low'], data['Close'], window=config['period'])
-        current_adx = adx.iloc[-1]
+        current_adx = _adx_njit(ctx['high'], ctx['low'], ctx['true_range'], config['period'])[-1]
         
         # Determine signal based on trend strength
         if current_adx > 25:
@@ -301,19 +364,21 @@ class TechnicalAnalyzer:
             signal = 'neutral'
             description = f"Moderate trend strength (ADX: {current_adx:.1f})"
         
-        return TechnicalIndicator(
+        return _make_indicator(
             name='ADX',
-            value=float(current_adx),
+            value=round(float(current_adx), 4),
             signal=signal,
             description=description
         )
     
-    def _calculate_cci(self, data: pd.DataFrame) -> TechnicalIndicator:
+    def _calculate_cci(self, ctx: Dict[Any, Any]) -> TechnicalIndicator:
         """Calculate Commodity Channel Index"""
         config = self.indicators_config['CCI']
         
-        cci = ta.trend.cci(data['High'], data['Low'], data['Close'], window=config['period'])
-        current_cci = cci.iloc[-1]
+        typical_price = _tail(ctx['typical_price'], config['period'])
+        mean_price = typical_price.mean()
+        mean_deviation = np.abs(typical_price - mean_price).mean()
+        current_cci = (typical_price[-1] - mean_price) / (0.015 * mean_deviation)
         
         # Determine signal
         if current_cci > 100:
@@ -326,20 +391,20 @@ class TechnicalAnalyzer:
             signal = 'neutral'
             description = f"CCI neutral ({current_cci:.1f})"
         
-        return TechnicalIndicator(
+        return _make_indicator(
             name='CCI',
-            value=float(current_cci),
+            value=round(float(current_cci), 4),
             signal=signal,
             description=description
         )
     
-    def _calculate_williams_r(self, data: pd.DataFrame) -> TechnicalIndicator:
+    def _calculate_williams_r(self, ctx: Dict[Any, Any]) -> TechnicalIndicator:
         """Calculate Williams %R"""
         config = self.indicators_config['WILLIAMS']
         
-        williams_r = ta.momentum.williams_r(data['High'], data['Low'], data['Close'], 
-                                          lbp=config['period'])
-        current_wr = williams_r.iloc[-1]
+        highest, lowest = ctx[('extremes', config['period'])]
+        highest_high, lowest_low = highest[-1], lowest[-1]
+        current_wr = -100 * (highest_high - ctx['close'][-1]) / (highest_high - lowest_low)
         
         # Determine signal
         if current_wr > -20:
@@ -352,9 +417,9 @@ class TechnicalAnalyzer:
             signal = 'neutral'
             description = f"Williams %R neutral ({current_wr:.1f})"
         
-        return TechnicalIndicator(
+        return _make_indicator(
             name='Williams %R',
-            value=float(current_wr),
+            value=round(float(current_wr), 4),
             signal=signal,
             description=description
         )
@@ -364,8 +429,12 @@ class TechnicalAnalyzer:
         if not indicators:
             return 'neutral', 0.0
         
-        buy_count = sum(1 for ind in indicators if ind.signal == 'buy')
-        sell_count = sum(1 for ind in indicators if ind.signal == 'sell')
+        # Tally buy and sell signals in one pass
+        buy_count = sell_count = 0
+        for ind in indicators:
+            signal = ind.signal
+            buy_count += signal == 'buy'
+            sell_count += signal == 'sell'
         total_count = len(indicators)
         
         buy_ratio = buy_count / total_count
@@ -387,25 +456,28 @@ class TechnicalAnalyzer:
     def _calculate_support_resistance(self, data: pd.DataFrame, window: int = 20) -> tuple[List[float], List[float]]:
         """Calculate support and resistance levels"""
         try:
-            # Use local minima and maxima to identify support and resistance
-            highs = data['High'].rolling(window=window, center=True).max()
-            lows = data['Low'].rolling(window=window, center=True).min()
+            if len(data) <= 2 * window:
+                return [], []
             
-            # Find resistance levels (local maxima)
-            resistance_levels = []
-            for i in range(window, len(data) - window):
-                if data['High'].iloc[i] == highs.iloc[i]:
-                    resistance_levels.append(float(data['High'].iloc[i]))
+            # Use local minima and maxima to identify support and resistance: bars that are
+            # the extreme of their centered window (bar i spans i - window//2 .. i + (window-1)//2),
+            # away from the edges
+            high = data['High'].to_numpy()
+            low = data['Low'].to_numpy()
+            start = window - window // 2
+            stop = len(data) - window - window // 2
+            highs = np.lib.stride_tricks.sliding_window_view(high, window)[start:stop].max(axis=1)
+            lows = np.lib.stride_tricks.sliding_window_view(low, window)[start:stop].min(axis=1)
             
-            # Find support levels (local minima)
-            support_levels = []
-            for i in range(window, len(data) - window):
-                if data['Low'].iloc[i] == lows.iloc[i]:
-                    support_levels.append(float(data['Low'].iloc[i]))
+            high = high[window:-window]
+            low = low[window:-window]
+            resistance = high[high == highs]
+            support = low[low == lows]
             
-            # Remove duplicates and sort
-            resistance_levels = sorted(list(set(resistance_levels)), reverse=True)[:5]
-            support_levels = sorted(list(set(support_levels)))[:5]
+            # Top 5 distinct levels by partial selection rather than a full sort
+            resistance_levels = _top_levels(-resistance, 5)
+            resistance_levels = [-level for level in resistance_levels]
+            support_levels = _top_levels(support, 5)
             
             return support_levels, resistance_levels
             
@@ -416,11 +488,17 @@ class TechnicalAnalyzer:
     def _analyze_trend(self, data: pd.DataFrame) -> Dict[str, Any]:
         """Analyze price trend"""
         try:
-            # Calculate trend using linear regression
-            prices = data['Close'].values
-            x = np.arange(len(prices))
+            # Calculate trend using least-squares linear regression (slope and R-squared only)
+            prices = data['Close'].to_numpy(dtype=np.float64)
+            dx = np.arange(len(prices), dtype=np.float64)
+            dx -= dx.mean()
+            dy = prices - prices.mean()
+            sxx = dx @ dx
+            sxy = dx @ dy
+            syy = dy @ dy
             
-            slope, intercept, r_value, p_value, std_err = stats.linregress(x, prices)
+            slope = sxy / sxx
+            r_squared = (sxy * sxy) / (sxx * syy) if syy > 0 else 0.0
             
             # Determine trend direction and strength
             if slope > 0:
@@ -431,12 +509,12 @@ class TechnicalAnalyzer:
                 trend_direction = 'sideways'
             
             # Calculate trend strength based on R-squared
-            trend_strength = abs(r_value) ** 2
+            trend_strength = r_squared
             
             # Calculate recent momentum (last 10 days vs previous 10 days)
-            if len(data) >= 20:
-                recent_avg = data['Close'].tail(10).mean()
-                previous_avg = data['Close'].iloc[-20:-10].mean()
+            if len(prices) >= 20:
+                recent_avg = prices[-10:].mean()
+                previous_avg = prices[-20:-10].mean()
                 momentum = (recent_avg - previous_avg) / previous_avg
             else:
                 momentum = 0.0
@@ -445,7 +523,7 @@ class TechnicalAnalyzer:
                 'direction': trend_direction,
                 'strength': float(trend_strength),
                 'slope': float(slope),
-                'r_squared': float(r_value ** 2),
+                'r_squared': float(r_squared),
                 'momentum': float(momentum),
                 'duration_days': len(data)
             }
@@ -460,3 +538,129 @@ class TechnicalAnalyzer:
                 'momentum': 0.0,
                 'duration_days': 0
             }
+
+@lru_cache(maxsize=2048)
+def _make_indicator(name: str, value: float, signal: str, description: str) -> TechnicalIndicator:
+    """Build a TechnicalIndicator, reusing the instance for repeated (name, rounded value, signal, description)"""
+    return TechnicalIndicator(name=name, value=value, signal=signal, description=description)
+
+# Indicator math on float64 arrays. Values match the ta library: EMAs are seeded with the first value
+# (pandas ewm(adjust=False)) and are NaN until a full window is available. A request computes all of its
+# indicators in turn on one worker thread. The recurrences are Numba kernels, cached on disk and releasing
+# the GIL so other requests' threads keep running; they run as plain Python where numba is unavailable.
+
+def _tail(x: np.ndarray, window: int) -> np.ndarray:
+    """Last window values, or NaNs if the series is shorter than the window"""
+    return x[-window:] if len(x) >= window else np.full(window, np.nan)
+
+def _tail_mean(x: np.ndarray, window: int) -> float:
+    """Mean of the last window values (the latest simple moving average)"""
+    return _tail(x, window).mean()
+
+def _top_levels(values: np.ndarray, count: int) -> List[float]:
+    """Smallest `count` distinct values in ascending order"""
+    if values.size > count:
+        # Everything up to the count-th smallest holds the answer unless duplicates crowd it out
+        pivot = np.partition(values, count - 1)[count - 1]
+        levels = np.unique(values[values <= pivot])
+        if levels.size >= count:
+            return levels[:count].tolist()
+    return np.unique(values)[:count].tolist()
+
+def _true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """True range; the first bar has no previous close and falls back to high - low"""
+    true_range = np.empty_like(close)
+    true_range[0] = high[0] - low[0]
+    np.subtract(np.maximum(high[1:], close[:-1]), np.minimum(low[1:], close[:-1]), out=true_range[1:])
+    return true_range
+
+def _windows(x: np.ndarray, window: int, count: int) -> np.ndarray:
+    """The last count rolling windows of x as a (count, window) view"""
+    return np.lib.stride_tricks.sliding_window_view(_tail(x, window + count - 1), window)
+
+@njit(cache=True, nogil=True)
+def _ema_njit(x, period):
+    """Exponential moving average with span period"""
+    alpha = 2.0 / (period + 1)
+    out = np.empty_like(x)
+    ema = x[0]
+    for i in range(len(x)):
+        ema = alpha * x[i] + (1.0 - alpha) * ema
+        out[i] = ema
+    out[:period - 1] = np.nan
+    return out
+
+@njit(cache=True, nogil=True)
+def _dual_ema_njit(x, fast, slow):
+    """Exponential moving averages for two spans in a single pass"""
+    alpha_fast = 2.0 / (fast + 1)
+    alpha_slow = 2.0 / (slow + 1)
+    out_fast = np.empty_like(x)
+    out_slow = np.empty_like(x)
+    ema_fast = x[0]
+    ema_slow = x[0]
+    for i in range(len(x)):
+        ema_fast = alpha_fast * x[i] + (1.0 - alpha_fast) * ema_fast
+        ema_slow = alpha_slow * x[i] + (1.0 - alpha_slow) * ema_slow
+        out_fast[i] = ema_fast
+        out_slow[i] = ema_slow
+    out_fast[:fast - 1] = np.nan
+    out_slow[:slow - 1] = np.nan
+    return out_fast, out_slow
+
+@njit(cache=True, nogil=True)
+def _rsi_njit(close, period):
+    """Wilder RSI"""
+    alpha = 1.0 / period
+    out = np.full(len(close), np.nan)
+    gain = 0.0
+    loss = 0.0
+    for i in range(1, len(close)):
+        delta = close[i] - close[i - 1]
+        gain = alpha * (delta if delta > 0 else 0.0) + (1.0 - alpha) * gain
+        loss = alpha * (-delta if delta < 0 else 0.0) + (1.0 - alpha) * loss
+        if i >= period - 1:
+            out[i] = 100.0 if loss == 0 else 100.0 - 100.0 / (1.0 + gain / loss)
+    return out
+
+@njit(cache=True, nogil=True)
+def _adx_njit(high, low, true_range, period):
+    """Average Directional Index: Wilder sums of true range and directional movement, then Wilder-smoothed DX"""
+    out = np.full(len(true_range), np.nan)
+    tr_sum = 0.0
+    plus_sum = 0.0
+    minus_sum = 0.0
+    adx = 0.0
+    for i in range(1, len(true_range)):
+        up_move = high[i] - high[i - 1]
+        down_move = low[i - 1] - low[i]
+        plus_dm = up_move if up_move > down_move and up_move > 0 else 0.0
+        minus_dm = down_move if down_move > up_move and down_move > 0 else 0.0
+        
+        # The first period values are summed, then s[t] = s[t-1] - s[t-1] / period + x[t]
+        if i <= period:
+            tr_sum += true_range[i]
+            plus_sum += plus_dm
+            minus_sum += minus_dm
+            if i < period:
+                continue
+        else:
+            tr_sum += true_range[i] - tr_sum / period
+            plus_sum += plus_dm - plus_sum / period
+            minus_sum += minus_dm - minus_sum / period
+        
+        plus_di = 100 * plus_sum / tr_sum
+        minus_di = 100 * minus_sum / tr_sum
+        dx = 100 * abs((plus_di - minus_di) / (plus_di + minus_di))
+        
+        # First ADX is the mean of the first period DX values, then Wilder smoothing
+        k = i - period
+        if k < period:
+            adx += dx
+            if k == period - 1:
+                adx /= period
+                out[i] = adx
+        else:
+            adx = (adx * (period - 1) + dx) / period
+            out[i] = adx
+    return out
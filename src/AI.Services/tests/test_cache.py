@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+from utils.cache import TTLCache
+
+def test_concurrent_misses_share_one_factory_call():
+    cache = TTLCache(ttl=60)
+    calls = []
+    
+    async def factory():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return 'value'
+    
+    async def main():
+        return await asyncio.gather(*[cache.get_or_set('key', factory) for _ in range(5)])
+    
+    assert asyncio.run(main()) == ['value'] * 5
+    assert len(calls) == 1
+    assert cache.get('key') == 'value'
+    assert not cache._locks and not cache._lock_users
+
+def test_failed_factory_leaves_no_lock_behind():
+    cache = TTLCache(ttl=60)
+    
+    async def factory():
+        await asyncio.sleep(0.01)
+        raise ValueError("no data")
+    
+    async def main():
+        return await asyncio.gather(*[cache.get_or_set(f'BAD{i % 3}', factory) for i in range(9)],
+                                    return_exceptions=True)
+    
+    results = asyncio.run(main())
+    
+    assert all(isinstance(result, ValueError) for result in results)
+    assert cache.get('BAD0') is None
+    assert not cache._locks and not cache._lock_users
+
+def test_entries_expire_and_are_evicted_beyond_maxsize():
+    cache = TTLCache(ttl=60, maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2, ttl=-1)
+    cache.set('c', 3)
+    cache.set('d', 4)
+    
+    assert cache.get('a') is None
+    assert cache.get('b') is None
+    assert (cache.get('c'), cache.get('d')) == (3, 4)
+
+def test_factory_error_propagates_to_the_caller():
+    cache = TTLCache(ttl=60)
+    
+    async def factory():
+        raise KeyError('missing')
+    
+    with pytest.raises(KeyError):
+        asyncio.run(cache.get_or_set('key', factory))
+
+def test_recently_read_entries_survive_eviction():
+    cache = TTLCache(ttl=60, maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+    
+    assert cache.get('b') is None
+    assert (cache.get('a'), cache.get('c')) == (1, 3)
@@ -0,0 +1,154 @@
+import asyncio
+
+import pytest
+
+from models.portfolio_models import PortfolioOptimizationRequest
+from services.portfolio_batcher import PortfolioBatcher
+
+class FakeOptimizer:
+    """Stands in for PortfolioOptimizer, recording calls instead of downloading and solving"""
+    
+    def __init__(self, prepare_delay: float = 0.0, fail_prepare: bool = False, fail_symbols: tuple = ()):
+        self.prepare_delay = prepare_delay
+        self.fail_prepare = fail_prepare
+        self.fail_symbols = set(fail_symbols)
+        self.prepared = []
+        self.active = 0
+        self.max_active = 0
+    
+    async def prepare_market_data(self, symbols):
+        self.prepared.append(tuple(symbols))
+        await asyncio.sleep(self.prepare_delay)
+        if self.fail_prepare:
+            raise ValueError("download failed")
+        return tuple(symbols)
+    
+    def select_market_data(self, market_data, universe, symbols):
+        return market_data
+    
+    async def optimize(self, symbols, risk_tolerance, investment_amount, constraints, market_data):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(0.01)
+            if self.fail_symbols & set(symbols):
+                raise ValueError(f"cannot optimize {symbols}")
+            return (tuple(symbols), investment_amount, market_data)
+        finally:
+            self.active -= 1
+
+def make_request(symbols, amount=1000.0):
+    return PortfolioOptimizationRequest(symbols=symbols, investment_amount=amount)
+
+def run_with_batcher(optimizer, scenario, **kwargs):
+    """Run scenario(batcher) against a started batcher and stop it afterwards"""
+    async def main():
+        batcher = PortfolioBatcher(optimizer, **kwargs)
+        await batcher.start()
+        try:
+            return await scenario(batcher)
+        finally:
+            await batcher.stop()
+    return asyncio.run(main())
+
+def test_requests_for_the_same_universe_share_one_download():
+    optimizer = FakeOptimizer()
+    
+    async def scenario(batcher):
+        return await asyncio.gather(
+            batcher.submit(make_request(['AAPL', 'MSFT'], 1000.0)),
+            batcher.submit(make_request(['MSFT', 'AAPL'], 2000.0)),
+            batcher.submit(make_request(['GOOG'], 3000.0))
+        )
+    
+    results = run_with_batcher(optimizer, scenario)
+    
+    assert sorted(optimizer.prepared) == [('AAPL', 'MSFT'), ('GOOG',)]
+    assert [amount for _, amount, _ in results] == [1000.0, 2000.0, 3000.0]
+    assert results[1][0] == ('MSFT', 'AAPL')
+
+def test_requests_in_a_group_are_optimized_concurrently():
+    optimizer = FakeOptimizer()
+    
+    async def scenario(batcher):
+        return await asyncio.gather(*[batcher.submit(make_request(['AAPL'], amount)) for amount in (1.0, 2.0, 3.0)])
+    
+    run_with_batcher(optimizer, scenario)
+    
+    assert optimizer.prepared == [('AAPL',)]
+    assert optimizer.max_active == 3
+
+def test_slow_group_does_not_block_later_batches():
+    optimizer = FakeOptimizer()
+    
+    async def scenario(batcher):
+        optimizer.prepare_delay = 1.0
+        slow = asyncio.create_task(batcher.submit(make_request(['SLOW'])))
+        await asyncio.sleep(0.1)
+        optimizer.prepare_delay = 0.0
+        fast = await asyncio.wait_for(batcher.submit(make_request(['FAST'])), timeout=0.5)
+        assert not slow.done()
+        slow.cancel()
+        return fast
+    
+    assert run_with_batcher(optimizer, scenario)[0] == ('FAST',)
+
+def test_market_data_failure_fails_every_request_in_the_group():
+    optimizer = FakeOptimizer(fail_prepare=True)
+    
+    async def scenario(batcher):
+        return await asyncio.gather(
+            batcher.submit(make_request(['AAPL'])),
+            batcher.submit(make_request(['AAPL'])),
+            return_exceptions=True
+        )
+    
+    results = run_with_batcher(optimizer, scenario)
+    
+    assert optimizer.prepared == [('AAPL',)]
+    assert all(isinstance(result, ValueError) for result in results)
+
+def test_optimize_failure_only_fails_its_own_request():
+    optimizer = FakeOptimizer(fail_symbols=('BAD',))
+    
+    async def scenario(batcher):
+        return await asyncio.gather(
+            batcher.submit(make_request(['AAPL', 'BAD'])),
+            batcher.submit(make_request(['AAPL'])),
+            return_exceptions=True
+        )
+    
+    bad, good = run_with_batcher(optimizer, scenario)
+    
+    assert isinstance(bad, ValueError)
+    assert good[0] == ('AAPL',)
+
+def test_stop_fails_requests_in_flight():
+    optimizer = FakeOptimizer(prepare_delay=10.0)
+    
+    async def main():
+        batcher = PortfolioBatcher(optimizer)
+        await batcher.start()
+        pending = asyncio.create_task(batcher.submit(make_request(['AAPL'])))
+        await asyncio.sleep(0.1)
+        await batcher.stop()
+        with pytest.raises(RuntimeError, match="stopped"):
+            await asyncio.wait_for(pending, timeout=1.0)
+        assert not batcher._groups
+    
+    asyncio.run(main())
+
+def test_stop_fails_requests_still_collecting():
+    optimizer = FakeOptimizer()
+    
+    async def main():
+        batcher = PortfolioBatcher(optimizer, max_wait=10.0)
+        await batcher.start()
+        pending = asyncio.create_task(batcher.submit(make_request(['AAPL'])))
+        await asyncio.sleep(0.1)
+        await batcher.stop()
+        with pytest.raises(RuntimeError, match="stopped"):
+            await asyncio.wait_for(pending, timeout=1.0)
+        assert optimizer.prepared == []
+    
+    asyncio.run(main())
@@ -0,0 +1,19 @@
+import asyncio
+
+from services.portfolio_optimizer import PortfolioOptimizer
+
+def test_failed_company_info_lookup_is_cached_as_a_placeholder():
+    optimizer = PortfolioOptimizer()
+    calls = []
+    
+    async def failing_fetch(symbol):
+        calls.append(symbol)
+        raise ValueError("401 Unauthorized")
+    
+    optimizer._fetch_company_info = failing_fetch
+    
+    async def main():
+        return [await optimizer._get_company_info('AAPL') for _ in range(3)]
+    
+    assert asyncio.run(main()) == [{'name': 'AAPL', 'sector': 'Unknown'}] * 3
+    assert calls == ['AAPL']
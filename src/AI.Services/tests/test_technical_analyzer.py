@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pydantic import ValidationError
+
+from services.technical_analyzer import TechnicalAnalyzer
+
+@pytest.fixture
+def prices() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, 300)))
+    return pd.DataFrame({
+        'Close': close,
+        'High': close * (1 + rng.uniform(0, 0.02, 300)),
+        'Low': close * (1 - rng.uniform(0, 0.02, 300))
+    })
+
+def test_shared_intermediates_match_indicators_calculated_alone(prices):
+    analyzer = TechnicalAnalyzer()
+    together = {indicator.name: indicator.value
+                for indicator in analyzer._calculate_indicators(prices, list(analyzer.indicators_config))}
+    
+    alone = {}
+    for name in analyzer.indicators_config:
+        (indicator,) = analyzer._calculate_indicators(prices, [name])
+        alone[indicator.name] = indicator.value
+    
+    assert len(together) == len(analyzer.indicators_config)
+    assert together == alone
+
+def test_stochastic_uses_the_last_d_period_windows(prices):
+    analyzer = TechnicalAnalyzer()
+    williams, stochastic = analyzer._calculate_indicators(prices, ['WILLIAMS', 'STOCH'])
+    
+    high, low, close = prices['High'], prices['Low'], prices['Close']
+    highest, lowest = high.rolling(14).max(), low.rolling(14).min()
+    stoch_k = 100 * (close - lowest) / (highest - lowest)
+    williams_r = -100 * (highest - close) / (highest - lowest)
+    assert stochastic.value == round(float(stoch_k.iloc[-1]), 4)
+    assert williams.value == round(float(williams_r.iloc[-1]), 4)
+
+def test_unknown_indicators_are_skipped(prices):
+    analyzer = TechnicalAnalyzer()
+    assert [indicator.name for indicator in analyzer._calculate_indicators(prices, ['FOO', 'RSI'])] == ['RSI']
+
+def test_cached_indicators_are_shared_and_immutable(prices):
+    analyzer = TechnicalAnalyzer()
+    (first,) = analyzer._calculate_indicators(prices, ['RSI'])
+    (second,) = analyzer._calculate_indicators(prices, ['RSI'])
+    
+    assert first is second
+    with pytest.raises(ValidationError):
+        first.signal = 'buy'
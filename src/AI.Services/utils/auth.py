@@ -1,22 +1,31 @@
 import jwt
+import os
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Same secret as the ASP.NET Core services; read and encoded once at import
+_JWT_SECRET = os.environ["JWT_SECRET_KEY"].encode()
+_JWT_ALGORITHMS = ["HS256"]
+_JWT_OPTIONS = {"verify_exp": True}
+
+# Claims for locally issued tokens
+_TOKEN_TTL = timedelta(hours=1)
+_DEFAULT_ROLES = ("User",)
+_ISS = "StockTradingAPI"
+_AUD = "StockTradingClient"
+
 def verify_jwt_token(token: str) -> Dict[str, Any]:
     """Verify JWT token and return payload"""
     try:
-        # In production, use the same secret key as your ASP.NET Core services
-        secret_key = "your-super-secret-key-that-is-at-least-32-characters-long-for-security"
-        
         # Decode the token
         payload = jwt.decode(
             token,
-            secret_key,
-            algorithms=["HS256"],
-            options={"verify_exp": True}
+            _JWT_SECRET,
+            algorithms=_JWT_ALGORITHMS,
+            options=_JWT_OPTIONS
         )
         
         return payload
@@ -34,19 +43,18 @@ def verify_jwt_token(token: str) -> Dict[str, Any]:
 def create_jwt_token(user_id: str, email: str, roles: list = None) -> str:
     """Create JWT token for testing purposes"""
     try:
-        secret_key = "your-super-secret-key-that-is-at-least-32-characters-long-for-security"
-        
+        now = datetime.utcnow()
         payload = {
             "user_id": user_id,
             "email": email,
-            "roles": roles or ["User"],
-            "iat": datetime.utcnow(),
-            "exp": datetime.utcnow() + timedelta(hours=1),
-            "iss": "StockTradingAPI",
-            "aud": "StockTradingClient"
+            "roles": roles or _DEFAULT_ROLES,
+            "iat": now,
+            "exp": now + _TOKEN_TTL,
+            "iss": _ISS,
+            "aud": _AUD
         }
         
-        token = jwt.encode(payload, secret_key, algorithm="HS256")
+        token = jwt.encode(payload, _JWT_SECRET, algorithm=_JWT_ALGORITHMS[0])
         return token
         
     except Exception as e:
@@ -0,0 +1,71 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+_MISSING = object()
+
+class TTLCache:
+    """In-process cache whose entries expire after a fixed time-to-live, least recently used evicted first"""
+    
+    def __init__(self, ttl: float, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        # (expires_at, value) by key, least recently used first
+        self._entries: OrderedDict = OrderedDict()
+        # Per-key locks exist only while a miss is in flight, with a count of the coroutines using each
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+        self._lock_users: Dict[Hashable, int] = {}
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return default
+        
+        self._entries.move_to_end(key)
+        return value
+    
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store value under key for ttl seconds (defaults to the cache TTL)"""
+        self._entries.pop(key, None)
+        if len(self._entries) >= self.maxsize:
+            self._evict()
+        self._entries[key] = (time.monotonic() + (ttl if ttl is not None else self.ttl), value)
+    
+    async def get_or_set(self, key: Hashable, factory: Callable[[], Awaitable[Any]],
+                         ttl: Optional[float] = None) -> Any:
+        """Return the cached value, awaiting factory() on a miss. Concurrent misses share one call."""
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        self._lock_users[key] = self._lock_users.get(key, 0) + 1
+        try:
+            async with lock:
+                value = self.get(key, _MISSING)
+                if value is _MISSING:
+                    value = await factory()
+                    self.set(key, value, ttl)
+        finally:
+            # Drop the lock with its last user, including when factory() raised and nothing was cached
+            self._lock_users[key] -= 1
+            if not self._lock_users[key]:
+                del self._lock_users[key]
+                del self._locks[key]
+        return value
+    
+    def _evict(self):
+        """Drop expired entries, then the least recently used ones until there is room"""
+        now = time.monotonic()
+        for key in [k for k, (expires_at, _) in self._entries.items() if expires_at <= now]:
+            del self._entries[key]
+        
+        while len(self._entries) >= self.maxsize:
+            self._entries.popitem(last=False)
@@ -0,0 +1,7 @@
+import os
+
+def web_concurrency() -> int:
+    """Number of server worker processes on this host: WEB_CONCURRENCY, else one per CPU in production
+    (main.py starts that many) and a single worker in development"""
+    default = (os.cpu_count() or 1) if os.getenv("ENV") == "production" else 1
+    return max(1, int(os.getenv("WEB_CONCURRENCY", default)))
@@ -1,8 +1,16 @@
+import atexit
 import logging
+import queue
 import sys
-from datetime import datetime
+import time
+import orjson
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
 
+# Records are queued by the calling thread and formatted/written to stdout by one listener thread
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_listener: Optional[QueueListener] = None
+
 def setup_logger(name: str, level: str = "INFO") -> logging.Logger:
     """Setup logger with consistent formatting"""
     
@@ -20,52 +28,72 @@ def setup_logger(name: str, level: str = "INFO") -> logging.Logger:
         datefmt='%Y-%m-%d %H:%M:%S'
     )
     
-    # Create console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(logging.INFO)
-    console_handler.setFormatter(formatter)
+    # Create the console handler once and serve it from the background listener
+    global _listener
+    if _listener is None:
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setLevel(logging.INFO)
+        console_handler.setFormatter(formatter)
+        
+        _listener = QueueListener(_log_queue, console_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
     
     # Add handlers to logger
-    logger.addHandler(console_handler)
+    logger.addHandler(QueueHandler(_log_queue))
     
     return logger
 
+def _dumps(data: dict) -> str:
+    """Serialize a log payload as a JSON line; values orjson can't encode fall back to str()"""
+    return orjson.dumps(data, default=str).decode()
+
 def log_api_request(logger: logging.Logger, endpoint: str, user_id: Optional[str] = None, 
                    request_data: Optional[dict] = None):
     """Log API request with standardized format"""
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    
     log_data = {
         'endpoint': endpoint,
         'user_id': user_id,
-        'timestamp': datetime.utcnow().isoformat()
+        'timestamp': time.time_ns()
     }
     
-    if request_data:
+    # Stringifying the payload is O(size), so only measure it when debugging
+    if request_data and logger.isEnabledFor(logging.DEBUG):
         log_data['request_size'] = len(str(request_data))
     
-    logger.info(f"API Request: {log_data}")
+    logger.info("API Request: %s", _dumps(log_data))
 
 def log_api_response(logger: logging.Logger, endpoint: str, status_code: int, 
                     response_time_ms: float, user_id: Optional[str] = None):
     """Log API response with standardized format"""
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    
     log_data = {
         'endpoint': endpoint,
         'status_code': status_code,
         'response_time_ms': response_time_ms,
         'user_id': user_id,
-        'timestamp': datetime.utcnow().isoformat()
+        'timestamp': time.time_ns()
     }
     
-    logger.info(f"API Response: {log_data}")
+    logger.info("API Response: %s", _dumps(log_data))
 
 def log_error(logger: logging.Logger, error: Exception, context: Optional[dict] = None):
     """Log error with context information"""
+    if not logger.isEnabledFor(logging.ERROR):
+        return
+    
     error_data = {
         'error_type': type(error).__name__,
         'error_message': str(error),
-        'timestamp': datetime.utcnow().isoformat()
+        'timestamp': time.time_ns()
     }
     
     if context:
         error_data['context'] = context
     
-    logger.error(f"Error occurred: {error_data}", exc_info=True)
+    logger.error("Error occurred: %s", _dumps(error_data), exc_info=True)
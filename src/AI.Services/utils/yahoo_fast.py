@@ -0,0 +1,77 @@
+import aiohttp
+import numpy as np
+import orjson
+from typing import Any, Dict, List, Tuple
+
+CHART_URL = "https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
+QUOTE_SUMMARY_URL = "https://query1.finance.yahoo.com/v10/finance/quoteSummary/{symbol}"
+SEARCH_URL = "https://query2.finance.yahoo.com/v1/finance/search"
+COOKIE_URL = "https://fc.yahoo.com"
+CRUMB_URL = "https://query2.finance.yahoo.com/v1/test/getcrumb"
+
+def create_session(limit: int = 64, limit_per_host: int = 0, keepalive_timeout: float = 15) -> aiohttp.ClientSession:
+    """Create the shared session for Yahoo Finance requests (call from within the running event loop)"""
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=limit, limit_per_host=limit_per_host,
+                                       keepalive_timeout=keepalive_timeout),
+        headers={'User-Agent': 'Mozilla/5.0'},
+        timeout=aiohttp.ClientTimeout(total=15)
+    )
+
+async def fetch_closes(session: aiohttp.ClientSession, symbol: str, range_: str = '2y',
+                       interval: str = '1d') -> Tuple[np.ndarray, np.ndarray]:
+    """Fetch (timestamps, adjusted closes) for a symbol from the chart API; missing closes are NaN"""
+    async with session.get(CHART_URL.format(symbol=symbol),
+                           params={'range': range_, 'interval': interval}) as response:
+        response.raise_for_status()
+        payload = orjson.loads(await response.read())
+    
+    chart = payload['chart']
+    if not chart.get('result'):
+        raise ValueError(f"No chart data for {symbol}: {chart.get('error')}")
+    
+    result = chart['result'][0]
+    timestamps = result.get('timestamp') or []
+    indicators = result['indicators']
+    adjclose = indicators.get('adjclose')
+    closes = adjclose[0]['adjclose'] if adjclose else indicators['quote'][0]['close']
+    
+    count = len(timestamps)
+    return (
+        np.fromiter(timestamps, dtype=np.int64, count=count),
+        np.fromiter((np.nan if close is None else close for close in closes), dtype=np.float64, count=count)
+    )
+
+async def fetch_crumb(session: aiohttp.ClientSession) -> str:
+    """Store Yahoo's cookie on the session and return the crumb that quoteSummary requests must carry with it"""
+    # Only the Set-Cookie header matters here; the page itself is a 404
+    async with session.get(COOKIE_URL, allow_redirects=False):
+        pass
+    async with session.get(CRUMB_URL) as response:
+        response.raise_for_status()
+        crumb = (await response.text()).strip()
+    
+    if not crumb or '<' in crumb:
+        raise ValueError("Yahoo Finance did not return a crumb")
+    return crumb
+
+async def fetch_company_info(session: aiohttp.ClientSession, symbol: str, crumb: str) -> Dict[str, str]:
+    """Fetch only the company name and sector from the quoteSummary API (crumb from fetch_crumb on this session)"""
+    async with session.get(QUOTE_SUMMARY_URL.format(symbol=symbol),
+                           params={'modules': 'assetProfile,price', 'crumb': crumb}) as response:
+        response.raise_for_status()
+        payload = orjson.loads(await response.read())
+    
+    result = (payload['quoteSummary'].get('result') or [{}])[0]
+    return {
+        'name': (result.get('price') or {}).get('longName') or symbol,
+        'sector': (result.get('assetProfile') or {}).get('sector') or 'Unknown'
+    }
+
+async def fetch_news(session: aiohttp.ClientSession, symbol: str, count: int = 20) -> List[Dict[str, Any]]:
+    """Fetch recent news items for a symbol from the search API (same source as yfinance's Ticker.news)"""
+    async with session.get(SEARCH_URL, params={'q': symbol, 'quotesCount': 0, 'newsCount': count}) as response:
+        response.raise_for_status()
+        payload = orjson.loads(await response.read())
+    
+    return payload.get('news') or []